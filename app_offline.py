@@ -4,15 +4,13 @@ This version works without external API calls or model downloads.
 """
 
 import streamlit as st
-import sys
-import os
+from collections import Counter
 from pathlib import Path
 
-# Add src to path for imports
-sys.path.append('src')
-
 from orgchar.config import Config
 from orgchar.document_processor import DocumentProcessor
+from orgchar.keyword_search import KeywordIndex
+from langchain.schema import Document
 
 # Page configuration
 st.set_page_config(
@@ -22,48 +20,74 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
+@st.cache_resource(show_spinner=False, max_entries=1)
+def _load_corpus(path: str, chunk_size: int, chunk_overlap: int, mtime: float) -> tuple[list[Document], dict]:
+    """
+    Process the knowledge base once per process and share it across sessions.
+    
+    ``mtime`` is only part of the cache key so edits to the knowledge base
+    directory invalidate the cached corpus.
+    
+    Returns:
+        Tuple of the document chunks and their summary statistics
+    """
+    processor = DocumentProcessor(chunk_size=chunk_size, chunk_overlap=chunk_overlap)
+    docs = processor.process_directory(Path(path))
+    
+    source_counts = Counter(doc.metadata['filename'] for doc in docs)
+    stats = {
+        'total_chunks': len(docs),
+        'sources': sorted(source_counts),
+        'total_sources': len(source_counts)
+    }
+    return docs, stats
+
+@st.cache_resource(show_spinner=False, max_entries=1)
+def _load_keyword_index(path: str, chunk_size: int, chunk_overlap: int, mtime: float) -> KeywordIndex:
+    """Build the keyword index once per corpus so chunks are lowercased and tokenized only once."""
+    docs, _ = _load_corpus(path, chunk_size, chunk_overlap, mtime)
+    return KeywordIndex(docs)
+
+def _knowledge_base_mtime(path: Path) -> float:
+    """Return the latest modification time under the knowledge base directory."""
+    # The directory's own mtime changes when files are added or removed
+    return max([path.stat().st_mtime, *(p.stat().st_mtime for p in path.rglob('*'))])
+
 def initialize_demo():
     """Initialize demo data."""
     if 'documents_processed' not in st.session_state:
         config = Config()
         config.ensure_directories()
         
-        # Process documents
-        processor = DocumentProcessor()
-        docs = processor.process_directory(config.KNOWLEDGE_BASE_PATH)
-        
-        st.session_state.documents_processed = docs
-        st.session_state.document_stats = {
-            'total_chunks': len(docs),
-            'sources': list(set(doc.metadata['filename'] for doc in docs)),
-            'total_sources': len(set(doc.metadata['filename'] for doc in docs))
-        }
+        # Process documents (shared across sessions via st.cache_resource)
+        corpus_key = (
+            str(config.KNOWLEDGE_BASE_PATH),
+            config.CHUNK_SIZE,
+            config.CHUNK_OVERLAP,
+            _knowledge_base_mtime(config.KNOWLEDGE_BASE_PATH)
+        )
+        st.session_state.documents_processed, st.session_state.document_stats = _load_corpus(*corpus_key)
+        st.session_state.keyword_index = _load_keyword_index(*corpus_key)
     
-    if 'chat_history' not in st.session_state:
-        st.session_state.chat_history = []
+    # Chat history as parallel question/answer lists
+    if 'chat_questions' not in st.session_state:
+        st.session_state.chat_questions = []
+        st.session_state.chat_answers = []
 
-def simulate_search(query: str, documents: list, k: int = 3):
-    """Simulate similarity search using keyword matching."""
-    keywords = query.lower().split()
-    
-    results = []
-    for doc in documents:
-        content_lower = doc.page_content.lower()
-        score = sum(1 for keyword in keywords if keyword in content_lower)
-        if score > 0:
-            results.append((doc, score))
-    
-    # Sort by relevance score and return top k
-    results.sort(key=lambda x: x[1], reverse=True)
-    return [doc for doc, score in results[:k]]
+def simulate_search(query: str, index: KeywordIndex, k: int = 3):
+    """Simulate similarity search using TF-IDF keyword matching."""
+    return index.search(query, k=k)
 
-def simulate_answer(question: str, context_docs: list) -> str:
-    """Simulate answer generation based on context."""
-    if not context_docs:
-        return "I don't have enough information in my knowledge base to answer that question. Please try rephrasing or ask about organizational behavior topics."
+@st.cache_data(max_entries=256, show_spinner=False)
+def simulate_answer(question: str, sources: tuple, preview: str, preview_source: str) -> str:
+    """
+    Simulate answer generation based on retrieved context.
     
-    # Extract key information from context
-    sources = [doc.metadata['filename'] for doc in context_docs]
+    Takes only hashable summaries of the context (distinct source filenames
+    and the top chunk's preview and filename) so answers can be memoized.
+    """
+    if not sources:
+        return "I don't have enough information in my knowledge base to answer that question. Please try rephrasing or ask about organizational behavior topics."
     
     # Simple response based on question keywords
     question_lower = question.lower()
@@ -83,7 +107,7 @@ def simulate_answer(question: str, context_docs: list) -> str:
 - Building trust and psychological safety is crucial for team performance
 - Leaders should focus on developing others and creating shared vision
 
-*This information is compiled from the knowledge base sources: {', '.join(set(sources))}*"""
+*This information is compiled from the knowledge base sources: {', '.join(sources)}*"""
     
     elif any(word in question_lower for word in ['team', 'teams', 'group', 'collaboration']):
         return f"""Based on the organizational behavior knowledge base, here's what we know about team dynamics:
@@ -108,7 +132,7 @@ def simulate_answer(question: str, context_docs: list) -> str:
 - Encourage continuous improvement
 - Build trust and respect among members
 
-*This information is compiled from the knowledge base sources: {', '.join(set(sources))}*"""
+*This information is compiled from the knowledge base sources: {', '.join(sources)}*"""
     
     elif any(word in question_lower for word in ['culture', 'organizational', 'behavior']):
         return f"""Based on the organizational behavior knowledge base:
@@ -142,18 +166,17 @@ Organizational behavior (OB) is the study of how people interact within groups a
 - Individual differences affect behavior
 - Humans are inherently social beings
 
-*This information is compiled from the knowledge base sources: {', '.join(set(sources))}*"""
+*This information is compiled from the knowledge base sources: {', '.join(sources)}*"""
     
     else:
         # General response using first context document
-        preview = context_docs[0].page_content[:300]
         return f"""Based on the information in my knowledge base, here's what I found:
 
 {preview}...
 
 For more specific information about organizational behavior topics like leadership, team dynamics, or organizational culture, please ask a more targeted question.
 
-*Source: {context_docs[0].metadata['filename']}*"""
+*Source: {preview_source}*"""
 
 def render_sidebar():
     """Render the sidebar."""
@@ -191,9 +214,20 @@ def render_sidebar():
     
     st.sidebar.markdown("---")
     if st.sidebar.button("🗑️ Clear Chat History"):
-        st.session_state.chat_history = []
+        st.session_state.chat_questions = []
+        st.session_state.chat_answers = []
         st.rerun()
 
+@st.fragment
+def render_chat_history():
+    """Render past chat messages as a fragment so it can rerun independently."""
+    for question, answer in zip(st.session_state.chat_questions, st.session_state.chat_answers):
+        with st.chat_message("user"):
+            st.write(question)
+        
+        with st.chat_message("assistant"):
+            st.write(answer)
+
 def render_main_content():
     """Render the main chat interface."""
     st.title("🏢 OrgChar - Organizational Behavior Assistant")
@@ -202,12 +236,7 @@ def render_main_content():
     st.warning("⚠️ This is a demonstration version with simulated responses. The full system requires API keys and internet access for AI model integration.")
     
     # Display chat history
-    for question, answer in st.session_state.chat_history:
-        with st.chat_message("user"):
-            st.write(question)
-        
-        with st.chat_message("assistant"):
-            st.write(answer)
+    render_chat_history()
     
     # Chat input
     question = st.chat_input("Ask about organizational behavior...")
@@ -225,23 +254,28 @@ def process_question(question: str):
     with st.chat_message("assistant"):
         with st.spinner("Searching knowledge base..."):
             # Simulate search
-            context_docs = simulate_search(question, st.session_state.documents_processed, k=3)
+            context_docs = simulate_search(question, st.session_state.keyword_index, k=3)
+            sources = tuple(sorted({doc.metadata['filename'] for doc in context_docs}))
             
             # Generate answer
-            answer = simulate_answer(question, context_docs)
+            if context_docs:
+                preview = context_docs[0].page_content[:300]
+                preview_source = context_docs[0].metadata['filename']
+            else:
+                preview, preview_source = "", ""
+            answer = simulate_answer(question, sources, preview, preview_source)
         
         st.write(answer)
         
         # Show sources
-        if context_docs:
+        if sources:
             with st.expander("📚 Knowledge Sources Used"):
-                sources = set(doc.metadata['filename'] for doc in context_docs)
                 for source in sources:
                     st.write(f"• {source}")
     
     # Add to chat history
-    st.session_state.chat_history.append((question, answer))
-    st.rerun()
+    st.session_state.chat_questions.append(question)
+    st.session_state.chat_answers.append(answer)
 
 def render_footer():
     """Render footer information."""
@@ -2,18 +2,14 @@
 OrgChar with Local LLM fallback
 """
 
-import sys
-import os
 from pathlib import Path
 import logging
-
-# Add src to Python path
-src_path = Path(__file__).parent / "src"
-sys.path.insert(0, str(src_path))
+from openai import OpenAI
 
 from orgchar.config import Config
-from orgchar.rag_system import RAGSystem
+from orgchar.rag_system import get_rag_system
 from orgchar.local_llm import LocalLLMAdapter
+from orgchar.launcher import run_streamlit_app
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -25,29 +21,35 @@ def main():
     config.ensure_directories()
     
     # Try to use OpenAI
-    rag_system = RAGSystem(config)
-    success = rag_system.load_knowledge_base()
+    rag_system = get_rag_system()
     
-    if not success:
+    if rag_system.get_knowledge_base_stats()['status'] != 'initialized':
         logger.error("Failed to load knowledge base")
         return
     
-    # Test if OpenAI API is working
+    # Test if OpenAI API is reachable with a cheap model listing
+    if openai_available(config):
+        logger.info("OpenAI API is working, starting app normally")
+        run_normal()
+    else:
+        logger.warning("OpenAI API not available, falling back to local LLM")
+        use_local_llm()
+
+def openai_available(config: Config) -> bool:
+    """Check whether the OpenAI API accepts the configured key."""
+    if not config.OPENAI_API_KEY:
+        return False
+    
     try:
-        test_response = rag_system.answer_question("Test question")
-        if "Error" in test_response.get('answer', '') and "API" in test_response.get('answer', ''):
-            logger.warning("OpenAI API not available, falling back to local LLM")
-            use_local_llm()
-        else:
-            logger.info("OpenAI API is working, starting app normally")
-            run_normal()
+        OpenAI(api_key=config.OPENAI_API_KEY, timeout=10).models.list()
+        return True
     except Exception as e:
-        logger.warning(f"Error testing OpenAI API: {e}, falling back to local LLM")
-        use_local_llm()
+        logger.warning(f"Error testing OpenAI API: {e}")
+        return False
 
 def run_normal():
     """Run the application with OpenAI."""
-    os.system("streamlit run app.py")
+    run_streamlit_app(Path(__file__).parent / "app.py")
 
 def use_local_llm():
     """Run the application with local LLM."""
@@ -55,7 +57,7 @@ def use_local_llm():
     
     # This would require modifying rag_system.py to use local_llm.py
     # For now, we'll just use the offline demo
-    os.system("streamlit run app_offline.py")
+    run_streamlit_app(Path(__file__).parent / "app_offline.py")
     
     # Inform the user
     print("\n" + "="*50)
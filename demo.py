@@ -3,13 +3,13 @@
 Demo script showing OrgChar functionality without requiring API keys.
 """
 
-import sys
+from collections import Counter
 from pathlib import Path
 
-# Add src to path
-sys.path.append('src')
+import numpy as np
 
 from orgchar.document_processor import DocumentProcessor
+from orgchar.keyword_search import KeywordIndex, top_k_indices
 from orgchar.config import Config
 
 def main():
@@ -34,11 +34,10 @@ def main():
     print()
 
     # Show document sources
-    sources = set(doc.metadata['filename'] for doc in docs)
+    source_counts = Counter(doc.metadata['filename'] for doc in docs)
     print("📂 Available knowledge sources:")
-    for source in sorted(sources):
-        source_docs = [doc for doc in docs if doc.metadata['filename'] == source]
-        print(f"   • {source} ({len(source_docs)} chunks)")
+    for source, chunk_count in sorted(source_counts.items()):
+        print(f"   • {source} ({chunk_count} chunks)")
     print()
 
     # Show sample content
@@ -53,22 +52,18 @@ def main():
     query = "What are leadership styles?"
     print(f"Query: {query}")
     
-    # Simple keyword matching simulation
-    relevant_docs = []
-    keywords = query.lower().split()
+    # Keyword search simulation over a TF-IDF index
+    index = KeywordIndex(docs)
+    scores = index.scores(query)
     
-    for doc in docs:
-        content_lower = doc.page_content.lower()
-        score = sum(1 for keyword in keywords if keyword in content_lower)
-        if score > 0:
-            relevant_docs.append((doc, score))
+    # Select the top results by relevance score
+    top = top_k_indices(scores, 3)
+    relevant_count = int(np.count_nonzero(scores))
     
-    # Sort by relevance score
-    relevant_docs.sort(key=lambda x: x[1], reverse=True)
-    
-    print(f"Found {len(relevant_docs)} relevant chunks:")
-    for i, (doc, score) in enumerate(relevant_docs[:3], 1):
-        print(f"{i}. {doc.metadata['filename']} (relevance: {score})")
+    print(f"Found {relevant_count} relevant chunks:")
+    for i, doc_index in enumerate(top[:relevant_count], 1):
+        doc = docs[doc_index]
+        print(f"{i}. {doc.metadata['filename']} (relevance: {scores[doc_index]:.2f})")
         print(f"   Preview: {doc.page_content[:100]}...")
         print()
 
@@ -7,6 +7,8 @@ import requests
 from dotenv import load_dotenv
 from urllib.parse import urlencode
 
+from orgchar.discord_api import get_bot_user
+
 # Load environment variables
 load_dotenv()
 
@@ -20,15 +22,8 @@ if not bot_token:
 print(f"Using bot token: {bot_token[:10]}...{bot_token[-5:]}")
 
 # Get the application ID using the Discord API
-headers = {
-    'Authorization': f'Bot {bot_token}'
-}
-
 try:
-    response = requests.get('https://discord.com/api/v10/users/@me', headers=headers)
-    response.raise_for_status()
-    
-    data = response.json()
+    data = get_bot_user(bot_token)
     client_id = data.get('id')
     bot_name = data.get('username')
     
@@ -55,7 +50,7 @@ try:
     
 except requests.exceptions.HTTPError as err:
     print(f"HTTP Error: {err}")
-    print(f"Response content: {response.text}")
+    print(f"Response content: {err.response.text}")
     print("\nPossible issues:")
     print("1. The bot token might be invalid or expired")
     print("2. The Discord API might be having issues")
@@ -3,18 +3,12 @@ Management script for OrgChar RAG system.
 """
 
 import sys
-import os
 import argparse
 import logging
 from pathlib import Path
 
-# Add src to Python path
-src_path = Path(__file__).parent / "src"
-sys.path.insert(0, str(src_path))
-
 from orgchar.config import Config
-from orgchar.rag_system import RAGSystem
-from orgchar.document_processor import DocumentProcessor
+from orgchar.launcher import run_streamlit_app
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -22,6 +16,8 @@ logger = logging.getLogger(__name__)
 
 def init_knowledge_base(args):
     """Initialize the knowledge base from documents."""
+    from orgchar.rag_system import RAGSystem
+    
     config = Config()
     config.ensure_directories()
     
@@ -39,6 +35,8 @@ def init_knowledge_base(args):
 
 def update_knowledge_base(args):
     """Update the knowledge base with new documents."""
+    from orgchar.rag_system import RAGSystem
+    
     config = Config()
     
     logger.info("Updating knowledge base...")
@@ -55,13 +53,11 @@ def update_knowledge_base(args):
 
 def show_stats(args):
     """Show knowledge base statistics."""
-    config = Config()
+    from orgchar.rag_system import get_rag_system
     
-    rag_system = RAGSystem(config)
-    loaded = rag_system.load_knowledge_base()
+    stats = get_rag_system().get_knowledge_base_stats()
     
-    if loaded:
-        stats = rag_system.get_knowledge_base_stats()
+    if stats['status'] == 'initialized':
         print("Knowledge Base Statistics:")
         print(f"  Status: {stats['status']}")
         print(f"  Document Count: {stats['document_count']}")
@@ -74,24 +70,10 @@ def run_streamlit(args):
     config = Config()
     config.ensure_directories()
     
-    import subprocess
-    import shutil
-    
     app_path = Path(__file__).parent / "app.py"
     
-    # Try to find streamlit in PATH or use the full path
-    streamlit_path = shutil.which("streamlit")
-    if not streamlit_path:
-        # Use the Python module directly if executable not found
-        cmd = ["python", "-m", "streamlit", "run", str(app_path)]
-    else:
-        cmd = [streamlit_path, "run", str(app_path)]
-    
-    if args.port:
-        cmd.extend(["--server.port", str(args.port)])
-    
     logger.info("Starting Streamlit application...")
-    subprocess.run(cmd)
+    run_streamlit_app(app_path, port=args.port)
 
 def run_discord_bot(args):
     """Run the Discord bot."""
@@ -107,12 +89,11 @@ def run_discord_bot(args):
 
 def test_system(args):
     """Test the RAG system with a sample question."""
-    config = Config()
+    from orgchar.rag_system import get_rag_system
     
-    rag_system = RAGSystem(config)
-    loaded = rag_system.load_knowledge_base()
+    rag_system = get_rag_system()
     
-    if not loaded:
+    if rag_system.get_knowledge_base_stats()['status'] != 'initialized':
         logger.error("Knowledge base not available. Run 'python manage.py init' first.")
         sys.exit(1)
     
@@ -0,0 +1,109 @@
+"""
+Exact-match answer cache with LRU eviction, expiry and a memory budget.
+"""
+
+import copy
+import hashlib
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+class SmartAnswerCache:
+    """Thread-safe LRU cache whose entries expire and whose total size is bounded."""
+
+    def __init__(self, max_entries: int = 512, ttl_s: float = 3600.0,
+                 max_bytes: int = 100 * 1024 * 1024):
+        """
+        Initialize the cache.
+
+        Args:
+            max_entries: Maximum number of cached answers
+            ttl_s: Seconds after which an entry expires
+            max_bytes: Approximate upper bound on the total size of cached values
+        """
+        self.max_entries = max_entries
+        self.ttl_s = ttl_s
+        self.max_bytes = max_bytes
+
+        # key -> (value, size, expires_at)
+        self._entries: "OrderedDict[str, Tuple[Any, int, float]]" = OrderedDict()
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(question: str, *parts: Any) -> str:
+        """
+        Build a cache key from a normalized question and extra key parts.
+
+        Args:
+            question: User question; case and surrounding whitespace are ignored
+            *parts: Further values the answer depends on (retrieval depth, model, ...)
+
+        Returns:
+            Hex digest identifying the request
+        """
+        raw = "\0".join([question.strip().lower(), *map(str, parts)])
+        return hashlib.blake2b(raw.encode('utf-8'), digest_size=16).hexdigest()
+
+    def get(self, key: str) -> Optional[Any]:
+        """
+        Look up a cached value.
+
+        Args:
+            key: Key from make_key()
+
+        Returns:
+            Copy of the cached value, or None if missing or expired
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+
+            value, size, expires_at = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                self._total_bytes -= size
+                return None
+
+            self._entries.move_to_end(key)
+        return copy.deepcopy(value)
+
+    def put(self, key: str, value: Any, size: int) -> None:
+        """
+        Store a value, evicting least recently used entries to stay within budget.
+
+        Args:
+            key: Key from make_key()
+            value: Value to cache
+            size: Approximate size of the value in bytes
+        """
+        if size > self.max_bytes:
+            logger.debug(f"Not caching answer of {size} bytes, larger than the cache budget")
+            return
+
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._total_bytes -= old[1]
+
+            self._entries[key] = (copy.deepcopy(value), size, time.monotonic() + self.ttl_s)
+            self._total_bytes += size
+
+            while len(self._entries) > self.max_entries or self._total_bytes > self.max_bytes:
+                _, (_, evicted_size, _) = self._entries.popitem(last=False)
+                self._total_bytes -= evicted_size
+
+    def clear(self) -> None:
+        """Remove all cached values."""
+        with self._lock:
+            self._entries.clear()
+            self._total_bytes = 0
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
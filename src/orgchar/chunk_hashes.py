@@ -0,0 +1,109 @@
+"""
+Persistent set of content hashes for chunks already in the vector index.
+"""
+
+import hashlib
+import logging
+import os
+import threading
+from pathlib import Path
+from typing import Iterable, List, Tuple
+
+from langchain.schema import Document
+
+logger = logging.getLogger(__name__)
+
+DIGEST_SIZE = 16
+
+def chunk_digest(text: str) -> bytes:
+    """
+    Hash chunk content.
+
+    Args:
+        text: Chunk text
+
+    Returns:
+        16-byte blake2b digest
+    """
+    return hashlib.blake2b(text.encode('utf-8'), digest_size=DIGEST_SIZE).digest()
+
+class ChunkHashSet:
+    """Set of chunk digests stored in a flat binary sidecar file."""
+
+    def __init__(self, path: Path):
+        """
+        Load the digest set from disk, starting empty if the file is missing.
+
+        Args:
+            path: Sidecar file of concatenated 16-byte digests
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        self._digests = set()
+
+        try:
+            data = path.read_bytes()
+            self._digests = {
+                data[i:i + DIGEST_SIZE] for i in range(0, len(data) - DIGEST_SIZE + 1, DIGEST_SIZE)
+            }
+            logger.info(f"Loaded {len(self._digests)} chunk hashes from {path}")
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            logger.warning(f"Failed to read chunk hashes from {path}: {e}")
+
+    def filter_new(self, documents: Iterable[Document]) -> Tuple[List[Document], List[bytes]]:
+        """
+        Drop chunks that are already indexed or repeated within the input.
+
+        Args:
+            documents: Candidate chunks
+
+        Returns:
+            Tuple of (chunks whose content has not been indexed yet, their
+            digests for add())
+        """
+        new_documents = []
+        new_digests = []
+        seen = set()
+        with self._lock:
+            for doc in documents:
+                digest = chunk_digest(doc.page_content)
+                if digest in self._digests or digest in seen:
+                    continue
+                seen.add(digest)
+                new_documents.append(doc)
+                new_digests.append(digest)
+        return new_documents, new_digests
+
+    def add(self, digests: Iterable[bytes]) -> None:
+        """
+        Record chunks as indexed and persist the set.
+
+        Args:
+            digests: Digests from filter_new() of the chunks added to the index
+        """
+        with self._lock:
+            self._digests.update(digests)
+            self._save()
+
+    def replace(self, digests: Iterable[bytes]) -> None:
+        """
+        Replace the whole set, e.g. after the index was rebuilt, and persist it.
+
+        Args:
+            digests: Digests of every chunk in the new index
+        """
+        with self._lock:
+            self._digests = set(digests)
+            self._save()
+
+    def _save(self) -> None:
+        """Write the set atomically; callers hold the lock."""
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            temp_path = self.path.with_suffix(self.path.suffix + '.tmp')
+            temp_path.write_bytes(b"".join(self._digests))
+            os.replace(temp_path, self.path)
+        except OSError as e:
+            logger.warning(f"Failed to save chunk hashes to {self.path}: {e}")
@@ -20,22 +20,40 @@ class Config:
     # Paths
     KNOWLEDGE_BASE_PATH = Path(os.getenv("KNOWLEDGE_BASE_PATH", "./knowledge_base"))
     VECTOR_DB_PATH = Path(os.getenv("VECTOR_DB_PATH", "./vector_db"))
+    CACHE_DIR = Path(os.getenv("CACHE_DIR", "./cache"))
     
-    # Document processing
-    CHUNK_SIZE = int(os.getenv("CHUNK_SIZE", 1000))
-    CHUNK_OVERLAP = int(os.getenv("CHUNK_OVERLAP", 200))
+    # Document processing (sizes are in tokens)
+    CHUNK_SIZE = int(os.getenv("CHUNK_SIZE", 250))
+    CHUNK_OVERLAP = int(os.getenv("CHUNK_OVERLAP", 50))
     
     # Model configuration
     EMBEDDING_MODEL = "sentence-transformers/all-MiniLM-L6-v2"
     LLM_MODEL = "gpt-3.5-turbo"
     TEMPERATURE = 0.7
+    EMBEDDING_BATCH_SIZE = int(os.getenv("EMBEDDING_BATCH_SIZE", 64))
+    
+    # Vector index ("hnsw" for approximate search, "flat" for exact search)
+    FAISS_INDEX_TYPE = os.getenv("FAISS_INDEX_TYPE", "hnsw")
+    HNSW_M = int(os.getenv("HNSW_M", 32))
+    HNSW_EF_CONSTRUCTION = int(os.getenv("HNSW_EF_CONSTRUCTION", 200))
+    HNSW_EF_SEARCH = int(os.getenv("HNSW_EF_SEARCH", 64))
+    FAISS_VECTOR_DTYPE = os.getenv("FAISS_VECTOR_DTYPE", "float16")
+    
+    # Caching
+    ANSWER_CACHE_SIZE = int(os.getenv("ANSWER_CACHE_SIZE", 1024))
+    ANSWER_CACHE_TTL = float(os.getenv("ANSWER_CACHE_TTL", 3600))
+    ANSWER_CACHE_MAX_BYTES = int(os.getenv("ANSWER_CACHE_MAX_BYTES", 100 * 1024 * 1024))
+    SEMANTIC_CACHE_SIZE = int(os.getenv("SEMANTIC_CACHE_SIZE", 256))
+    SEMANTIC_CACHE_THRESHOLD = float(os.getenv("SEMANTIC_CACHE_THRESHOLD", 0.95))
     
     # Streamlit configuration
     STREAMLIT_PAGE_TITLE = "OrgChar - Organizational Behavior Chatbot"
     STREAMLIT_PAGE_ICON = "🏢"
+    CHAT_HISTORY_WINDOW = int(os.getenv("CHAT_HISTORY_WINDOW", 30))
     
     @classmethod
     def ensure_directories(cls):
         """Ensure required directories exist."""
         cls.KNOWLEDGE_BASE_PATH.mkdir(parents=True, exist_ok=True)
-        cls.VECTOR_DB_PATH.mkdir(parents=True, exist_ok=True)
\ No newline at end of file
+        cls.VECTOR_DB_PATH.mkdir(parents=True, exist_ok=True)
+        cls.CACHE_DIR.mkdir(parents=True, exist_ok=True)
\ No newline at end of file
@@ -0,0 +1,46 @@
+"""
+Helpers for calling the Discord REST API from the setup scripts.
+"""
+
+import hashlib
+import json
+from pathlib import Path
+from typing import Dict, Optional
+
+import requests
+
+# Cache of bot user lookups, keyed by a hash of the token
+BOT_CACHE_PATH = Path.home() / ".cache" / "orgchar" / "bot_ids.json"
+
+def get_bot_user(token: str) -> Dict[str, Optional[str]]:
+    """
+    Return the bot's id and username, using the on-disk cache when possible.
+
+    Args:
+        token: Discord bot token
+
+    Returns:
+        Dictionary with 'id' and 'username'
+
+    Raises:
+        requests.exceptions.HTTPError: If the Discord API rejects the request
+    """
+    key = hashlib.sha256(token.encode()).hexdigest()[:16]
+    try:
+        cache = json.loads(BOT_CACHE_PATH.read_text())
+    except (OSError, ValueError):
+        cache = {}
+
+    if key not in cache:
+        response = requests.get(
+            'https://discord.com/api/v10/users/@me',
+            headers={'Authorization': f'Bot {token}'},
+            timeout=(3.05, 10)
+        )
+        response.raise_for_status()
+        data = response.json()
+        cache[key] = {'id': data.get('id'), 'username': data.get('username')}
+        BOT_CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+        BOT_CACHE_PATH.write_text(json.dumps(cache))
+
+    return cache[key]
@@ -6,12 +6,9 @@ import discord
 from discord.ext import commands
 import logging
 import asyncio
-from typing import Optional
-import sys
-import os
-
-# Add src to path for imports
-sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+import re
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
 
 from orgchar.config import Config
 from orgchar.rag_system import RAGSystem
@@ -46,13 +43,125 @@ class OrgCharBot(commands.Bot):
         # Initialize RAG system
         self.rag_system = RAGSystem(self.config)
         self.rag_loaded = False
+        
+        # Dedicated pool for blocking RAG calls so they never run on the event loop
+        self.rag_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="orgchar-rag")
+        
+        # Answers currently being computed, keyed by normalized question
+        self._inflight: Dict[str, asyncio.Future] = {}
+        
+        # Matches both <@id> and nickname <@!id> mentions; see mention_re
+        self._mention_re: Optional[re.Pattern] = None
+        
+        # Static embeds are built once and reused
+        self.help_embed = build_help_embed()
+        self.stats_embed = build_stats_embed()
+        
+        # Knowledge base refreshes run one at a time; at most one more can wait
+        self._refresh_queue: Optional[asyncio.Queue] = None
+        self._refresh_task: Optional[asyncio.Task] = None
+    
+    @property
+    def mention_re(self) -> re.Pattern:
+        """Pattern matching mentions of the bot, compiled on first use once the bot user is known."""
+        if self._mention_re is None:
+            self._mention_re = re.compile(rf'<@!?{self.user.id}>')
+        return self._mention_re
+    
+    async def run_blocking(self, func: Callable[..., Any], *args) -> Any:
+        """
+        Run a blocking function in the RAG thread pool.
+        
+        Args:
+            func: Function to call
+            *args: Positional arguments for func
+            
+        Returns:
+            The function's return value
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.rag_executor, func, *args)
+    
+    async def get_answer(self, question: str) -> Dict[str, Any]:
+        """
+        Answer a question, sharing one RAG call between identical concurrent requests.
+        
+        Args:
+            question: User's question
+            
+        Returns:
+            RAG response dictionary
+        """
+        key = question.lower().strip()
+        
+        future = self._inflight.get(key)
+        if future is None:
+            future = asyncio.ensure_future(
+                self.run_blocking(self.rag_system.answer_question, question)
+            )
+            self._inflight[key] = future
+            future.add_done_callback(lambda _: self._inflight.pop(key, None))
+        else:
+            logger.debug(f"Joining in-flight request for: {question[:50]}")
+        
+        # Shield so one cancelled waiter does not cancel the shared call
+        return await asyncio.shield(future)
+    
+    async def close(self):
+        """Shut down the bot and its RAG thread pool."""
+        if self._refresh_task is not None:
+            self._refresh_task.cancel()
+        await super().close()
+        self.rag_executor.shutdown(wait=False)
+    
+    def queue_refresh(self, ctx: commands.Context) -> bool:
+        """
+        Queue a knowledge base refresh requested from a command.
+        
+        Args:
+            ctx: Command context to reply to when the refresh finishes
+            
+        Returns:
+            True if queued, False if a refresh is already waiting
+        """
+        try:
+            self._refresh_queue.put_nowait(ctx)
+            return True
+        except asyncio.QueueFull:
+            return False
+    
+    async def _refresh_worker(self):
+        """Run queued knowledge base refreshes one at a time."""
+        while True:
+            ctx = await self._refresh_queue.get()
+            try:
+                success = await self.run_blocking(self.rag_system.update_knowledge_base)
+                
+                if success:
+                    self.rag_loaded = True
+                    await ctx.reply("✅ Knowledge base refreshed successfully!")
+                else:
+                    await ctx.reply("❌ Failed to refresh knowledge base.")
+                    
+            except Exception as e:
+                logger.error(f"Error refreshing knowledge base: {e}")
+                try:
+                    await ctx.reply(f"❌ Error refreshing knowledge base: {str(e)}")
+                except Exception:
+                    pass
+            finally:
+                self._refresh_queue.task_done()
     
     async def setup_hook(self):
         """Setup hook called when bot is starting up."""
         logger.info("Setting up OrgChar Discord bot...")
         
+        # Start the refresh worker
+        self._refresh_queue = asyncio.Queue(maxsize=1)
+        self._refresh_task = asyncio.create_task(self._refresh_worker())
+        
         # Load knowledge base
-        success = self.rag_system.load_knowledge_base()
+        success = await self.run_blocking(self.rag_system.load_knowledge_base)
         if success:
             self.rag_loaded = True
             logger.info("Knowledge base loaded successfully")
@@ -94,7 +203,7 @@ class OrgCharBot(commands.Bot):
     async def _handle_mention(self, message):
         """Handle when bot is mentioned."""
         # Remove mention from message
-        content = message.content.replace(f'<@{self.user.id}>', '').strip()
+        content = self.mention_re.sub('', message.content).strip()
         
         if not content:
             await message.reply(
@@ -119,7 +228,7 @@ class OrgCharBot(commands.Bot):
         async with message.channel.typing():
             try:
                 # Get answer from RAG system
-                response = self.rag_system.answer_question(question)
+                response = await self.get_answer(question)
                 
                 # Prepare response
                 answer = response['answer']
@@ -160,6 +269,68 @@ class OrgCharBot(commands.Bot):
                 logger.error(f"Error answering question: {e}")
                 await message.reply(f"❌ Error processing your question: {str(e)}")
 
+def build_help_embed() -> discord.Embed:
+    """
+    Build the static help embed.
+    
+    Returns:
+        Help embed listing usage and commands
+    """
+    embed = discord.Embed(
+        title="🏢 OrgChar Bot Help",
+        description="I'm your organizational behavior assistant! Here's how to use me:",
+        color=0x9b59b6
+    )
+    
+    embed.add_field(
+        name="🗨️ Direct Questions",
+        value="Mention me with your question:\n`@OrgChar What is transformational leadership?`",
+        inline=False
+    )
+    
+    embed.add_field(
+        name="📝 Commands",
+        value=(
+            "`!org ask <question>` - Ask a specific question\n"
+            "`!org stats` - View knowledge base statistics\n"
+            "`!org orghelp` - Show this help message\n"
+            "`!org refresh` - Refresh knowledge base (Admin only)"
+        ),
+        inline=False
+    )
+    
+    embed.add_field(
+        name="💡 Example Topics",
+        value=(
+            "• Leadership styles and theories\n"
+            "• Team dynamics and collaboration\n"
+            "• Organizational culture and change\n"
+            "• Employee motivation and engagement\n"
+            "• Workplace communication"
+        ),
+        inline=False
+    )
+    
+    embed.set_footer(text="OrgChar • Organizational Behavior Assistant")
+    
+    return embed
+
+def build_stats_embed() -> discord.Embed:
+    """
+    Build the stats embed skeleton; field values are filled in per request.
+    
+    Returns:
+        Stats embed with placeholder Status, Documents and Embedding Model fields
+    """
+    embed = discord.Embed(
+        title="📊 Knowledge Base Statistics",
+        color=0x2ecc71
+    )
+    embed.add_field(name="Status", value="-", inline=True)
+    embed.add_field(name="Documents", value="-", inline=True)
+    embed.add_field(name="Embedding Model", value="-", inline=True)
+    return embed
+
 # Bot commands
 @commands.command(name='ask', aliases=['question', 'q'])
 async def ask_question(ctx, *, question: str):
@@ -185,27 +356,21 @@ async def knowledge_base_stats(ctx):
         return
     
     try:
-        stats = bot.rag_system.get_knowledge_base_stats()
-        
-        embed = discord.Embed(
-            title="📊 Knowledge Base Statistics",
-            color=0x2ecc71
-        )
+        stats = await bot.run_blocking(bot.rag_system.get_knowledge_base_stats)
         
-        embed.add_field(
-            name="Status",
+        embed = bot.stats_embed.copy()
+        embed.set_field_at(
+            0, name="Status",
             value="✅ Online" if stats['status'] == 'initialized' else "❌ Offline",
             inline=True
         )
-        
-        embed.add_field(
-            name="Documents",
+        embed.set_field_at(
+            1, name="Documents",
             value=stats.get('document_count', 0),
             inline=True
         )
-        
-        embed.add_field(
-            name="Embedding Model",
+        embed.set_field_at(
+            2, name="Embedding Model",
             value=stats.get('embedding_model', 'Unknown'),
             inline=True
         )
@@ -226,19 +391,10 @@ async def refresh_knowledge_base(ctx):
     """
     bot = ctx.bot
     
-    async with ctx.typing():
-        try:
-            success = bot.rag_system.update_knowledge_base()
-            
-            if success:
-                bot.rag_loaded = True
-                await ctx.reply("✅ Knowledge base refreshed successfully!")
-            else:
-                await ctx.reply("❌ Failed to refresh knowledge base.")
-                
-        except Exception as e:
-            logger.error(f"Error refreshing knowledge base: {e}")
-            await ctx.reply(f"❌ Error refreshing knowledge base: {str(e)}")
+    if bot.queue_refresh(ctx):
+        await ctx.reply("🔄 Knowledge base refresh queued. I'll reply here when it finishes.")
+    else:
+        await ctx.reply("⏳ A knowledge base refresh is already queued.")
 
 @commands.command(name='orghelp', aliases=['commands', 'usage'])
 async def bot_help(ctx):
@@ -247,44 +403,7 @@ async def bot_help(ctx):
     
     Usage: !org orghelp
     """
-    embed = discord.Embed(
-        title="🏢 OrgChar Bot Help",
-        description="I'm your organizational behavior assistant! Here's how to use me:",
-        color=0x9b59b6
-    )
-    
-    embed.add_field(
-        name="🗨️ Direct Questions",
-        value="Mention me with your question:\n`@OrgChar What is transformational leadership?`",
-        inline=False
-    )
-    
-    embed.add_field(
-        name="📝 Commands",
-        value=(
-            "`!org ask <question>` - Ask a specific question\n"
-            "`!org stats` - View knowledge base statistics\n"
-            "`!org orghelp` - Show this help message\n"
-            "`!org refresh` - Refresh knowledge base (Admin only)"
-        ),
-        inline=False
-    )
-    
-    embed.add_field(
-        name="💡 Example Topics",
-        value=(
-            "• Leadership styles and theories\n"
-            "• Team dynamics and collaboration\n"
-            "• Organizational culture and change\n"
-            "• Employee motivation and engagement\n"
-            "• Workplace communication"
-        ),
-        inline=False
-    )
-    
-    embed.set_footer(text="OrgChar • Organizational Behavior Assistant")
-    
-    await ctx.reply(embed=embed)
+    await ctx.reply(embed=ctx.bot.help_embed)
 
 # Add commands to bot
 async def setup_commands(bot):
@@ -3,35 +3,98 @@ Document processing module for handling PDF and text documents.
 """
 
 import os
+import functools
+import itertools
 import logging
+import mmap
+import multiprocessing
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from pathlib import Path
-from typing import List, Optional
+from typing import Callable, Iterable, Iterator, List, Optional
 from PyPDF2 import PdfReader
 from langchain.text_splitter import RecursiveCharacterTextSplitter
 from langchain.schema import Document
 
 logger = logging.getLogger(__name__)
 
+@functools.lru_cache(maxsize=None)
+def token_length_function(encoding_name: str = "cl100k_base") -> Callable[[str], int]:
+    """
+    Build a function that measures text length in tokens.
+    
+    Falls back to an estimate of four characters per token if the tiktoken
+    encoding cannot be loaded (for example when offline on first use).
+    
+    Args:
+        encoding_name: tiktoken encoding name
+        
+    Returns:
+        Function mapping text to its token count
+    """
+    try:
+        import tiktoken
+        encoding = tiktoken.get_encoding(encoding_name)
+    except Exception as e:
+        logger.warning(f"tiktoken encoding {encoding_name} unavailable ({e}), estimating token counts")
+        return lambda text: (len(text) + 3) // 4
+    
+    return lambda text: len(encoding.encode(text, disallowed_special=()))
+
+def _bounded_map(executor: Executor, fn: Callable, items: Iterable, window: int) -> Iterator:
+    """
+    Like Executor.map, but with at most `window` calls submitted at a time.
+    
+    Executor.map submits every item up front, so when results are consumed
+    slower than they are produced they all accumulate in memory.
+    
+    Args:
+        executor: Executor to run the calls on
+        fn: Function to apply
+        items: Inputs to fn
+        window: Maximum number of submitted but not yet consumed calls
+        
+    Yields:
+        Results of fn, in input order
+    """
+    items = iter(items)
+    pending = deque(executor.submit(fn, item) for item in itertools.islice(items, window))
+    while pending:
+        result = pending.popleft().result()
+        for item in itertools.islice(items, 1):
+            pending.append(executor.submit(fn, item))
+        yield result
+
 class DocumentProcessor:
     """Handles document loading, processing, and chunking."""
     
-    def __init__(self, chunk_size: int = 1000, chunk_overlap: int = 200):
+    SUPPORTED_EXTENSIONS = {'.pdf', '.txt', '.md'}
+    
+    # Text files above this size (in bytes) are read through mmap
+    MMAP_THRESHOLD = 1_000_000
+    
+    # Files above this size (in bytes) are skipped during directory loads
+    MAX_FILE_BYTES = 256 * 1024 * 1024
+    
+    def __init__(self, chunk_size: int = 250, chunk_overlap: int = 50):
         """
         Initialize the document processor.
         
         Args:
-            chunk_size: Maximum size of text chunks
-            chunk_overlap: Overlap between chunks for context preservation
+            chunk_size: Maximum size of text chunks, in tokens
+            chunk_overlap: Overlap between chunks for context preservation, in tokens
         """
         self.chunk_size = chunk_size
         self.chunk_overlap = chunk_overlap
         self.text_splitter = RecursiveCharacterTextSplitter(
             chunk_size=chunk_size,
             chunk_overlap=chunk_overlap,
-            length_function=len,
+            length_function=token_length_function(),
         )
     
-    def load_pdf(self, file_path: Path) -> str:
+    @staticmethod
+    def load_pdf(file_path: Path) -> str:
         """
         Load and extract text from a PDF file.
         
@@ -45,19 +108,23 @@ class DocumentProcessor:
             Exception: If PDF reading fails
         """
         try:
-            reader = PdfReader(file_path)
-            text = ""
-            for page in reader.pages:
-                text += page.extract_text() + "\n"
-            return text.strip()
+            # Non-strict parsing skips validation work and tolerates minor spec violations
+            reader = PdfReader(file_path, strict=False)
+            # extract_text() may return None for pages without a text layer
+            parts = [page.extract_text() for page in reader.pages]
+            return "\n".join(part for part in parts if part).strip()
         except Exception as e:
             logger.error(f"Error reading PDF {file_path}: {e}")
             raise
     
-    def load_text_file(self, file_path: Path) -> str:
+    @staticmethod
+    def load_text_file(file_path: Path) -> str:
         """
         Load text from a text file.
         
+        Files larger than MMAP_THRESHOLD are memory-mapped and decoded
+        straight from the mapping, avoiding an intermediate bytes copy.
+        
         Args:
             file_path: Path to the text file
             
@@ -65,12 +132,57 @@ class DocumentProcessor:
             File content as string
         """
         try:
+            if file_path.stat().st_size > DocumentProcessor.MMAP_THRESHOLD:
+                with open(file_path, 'rb') as file, \
+                        mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                    content = str(mapped, 'utf-8')
+                # Match the newline translation of text-mode reads
+                if '\r' in content:
+                    content = content.replace('\r\n', '\n').replace('\r', '\n')
+                return content
+            
             with open(file_path, 'r', encoding='utf-8') as file:
                 return file.read()
         except Exception as e:
             logger.error(f"Error reading text file {file_path}: {e}")
             raise
     
+    @staticmethod
+    def load_document(file_path: Path) -> Optional[Document]:
+        """
+        Load a single supported document.
+        
+        This is a static method so it can be sent to worker processes.
+        
+        Args:
+            file_path: Path to the PDF, TXT or MD file
+            
+        Returns:
+            Document object, or None if the file is empty or failed to load
+        """
+        try:
+            if file_path.suffix.lower() == '.pdf':
+                content = DocumentProcessor.load_pdf(file_path)
+            else:
+                content = DocumentProcessor.load_text_file(file_path)
+            
+            if not content.strip():
+                logger.warning(f"Empty document: {file_path.name}")
+                return None
+            
+            logger.info(f"Loaded document: {file_path.name}")
+            return Document(
+                page_content=content,
+                metadata={
+                    'source': str(file_path),
+                    'filename': file_path.name,
+                    'type': file_path.suffix[1:].upper()
+                }
+            )
+        except Exception as e:
+            logger.error(f"Failed to load {file_path}: {e}")
+            return None
+    
     def load_documents_from_directory(self, directory_path: Path) -> List[Document]:
         """
         Load all supported documents from a directory.
@@ -81,39 +193,85 @@ class DocumentProcessor:
         Returns:
             List of processed Document objects
         """
-        documents = []
-        supported_extensions = {'.pdf', '.txt', '.md'}
+        return list(self.iter_documents_from_directory(directory_path))
+    
+    def iter_documents_from_directory(self, directory_path: Path) -> Iterator[Document]:
+        """
+        Lazily load all supported documents from a directory.
+        
+        Files are parsed in parallel worker processes, since PDF text
+        extraction is CPU-bound and holds the GIL; a thread pool is used if
+        processes cannot be started. Results keep the directory walk order.
         
+        Args:
+            directory_path: Path to directory containing documents
+            
+        Yields:
+            Processed Document objects
+        """
         if not directory_path.exists():
             logger.warning(f"Directory {directory_path} does not exist")
-            return documents
-        
-        for file_path in directory_path.rglob('*'):
-            if file_path.is_file() and file_path.suffix.lower() in supported_extensions:
-                try:
-                    if file_path.suffix.lower() == '.pdf':
-                        content = self.load_pdf(file_path)
-                    else:
-                        content = self.load_text_file(file_path)
-                    
-                    if content.strip():
-                        doc = Document(
-                            page_content=content,
-                            metadata={
-                                'source': str(file_path),
-                                'filename': file_path.name,
-                                'type': file_path.suffix[1:].upper()
-                            }
-                        )
-                        documents.append(doc)
-                        logger.info(f"Loaded document: {file_path.name}")
-                    else:
-                        logger.warning(f"Empty document: {file_path.name}")
-                        
-                except Exception as e:
-                    logger.error(f"Failed to load {file_path}: {e}")
-        
-        return documents
+            return
+        
+        file_paths = list(self._find_supported_files(directory_path))
+        if not file_paths:
+            return
+        
+        max_workers = min(os.cpu_count() or 4, len(file_paths))
+        # Keep only a few parsed documents ahead of the (slower) embedding consumer
+        window = 2 * max_workers
+        completed = 0
+        try:
+            # Never fork: callers (Streamlit, the Discord bot) are multi-threaded
+            # and have torch loaded, which makes forked children deadlock-prone
+            start_method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+            with ProcessPoolExecutor(max_workers=max_workers,
+                                     mp_context=multiprocessing.get_context(start_method)) as executor:
+                for doc in _bounded_map(executor, DocumentProcessor.load_document, file_paths, window):
+                    completed += 1
+                    if doc is not None:
+                        yield doc
+        except (OSError, NotImplementedError, BrokenProcessPool) as e:
+            logger.warning(f"Process pool unavailable ({e}), loading documents on threads")
+            # Resume after the files that were already yielded
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                for doc in _bounded_map(executor, DocumentProcessor.load_document, file_paths[completed:], window):
+                    if doc is not None:
+                        yield doc
+    
+    def _find_supported_files(self, directory_path: Path) -> Iterator[Path]:
+        """
+        Recursively find supported files, skipping hidden entries and oversized files.
+        
+        Uses os.scandir, whose entries carry cached file type information, so
+        only matching files need a stat call.
+        
+        Args:
+            directory_path: Directory to search
+            
+        Yields:
+            Paths of supported files
+        """
+        try:
+            entries = list(os.scandir(directory_path))
+        except OSError as e:
+            logger.warning(f"Cannot read directory {directory_path}: {e}")
+            return
+        
+        for entry in entries:
+            if entry.name.startswith('.'):
+                continue
+            
+            # Like Path.rglob, don't descend into symlinked directories (avoids
+            # symlink loops); symlinked files are still loaded
+            if entry.is_dir(follow_symlinks=False):
+                yield from self._find_supported_files(Path(entry.path))
+            elif entry.is_file() and os.path.splitext(entry.name)[1].lower() in self.SUPPORTED_EXTENSIONS:
+                size = entry.stat().st_size
+                if size > self.MAX_FILE_BYTES:
+                    logger.warning(f"Skipping {entry.path}: {size} bytes exceeds the {self.MAX_FILE_BYTES} byte limit")
+                    continue
+                yield Path(entry.path)
     
     def chunk_documents(self, documents: List[Document]) -> List[Document]:
         """
@@ -125,8 +283,21 @@ class DocumentProcessor:
         Returns:
             List of chunked documents
         """
-        chunked_docs = []
+        chunked_docs = list(self.iter_chunks(documents))
+        
+        logger.info(f"Created {len(chunked_docs)} chunks from {len(documents)} documents")
+        return chunked_docs
+    
+    def iter_chunks(self, documents: Iterable[Document]) -> Iterator[Document]:
+        """
+        Lazily split documents into chunks.
         
+        Args:
+            documents: Documents to chunk
+            
+        Yields:
+            Chunked documents
+        """
         for doc in documents:
             chunks = self.text_splitter.split_text(doc.page_content)
             
@@ -135,14 +306,10 @@ class DocumentProcessor:
                 chunk_metadata['chunk_id'] = i
                 chunk_metadata['total_chunks'] = len(chunks)
                 
-                chunked_doc = Document(
+                yield Document(
                     page_content=chunk,
                     metadata=chunk_metadata
                 )
-                chunked_docs.append(chunked_doc)
-        
-        logger.info(f"Created {len(chunked_docs)} chunks from {len(documents)} documents")
-        return chunked_docs
     
     def process_directory(self, directory_path: Path) -> List[Document]:
         """
@@ -167,4 +334,37 @@ class DocumentProcessor:
         chunked_documents = self.chunk_documents(documents)
         
         logger.info(f"Successfully processed {len(documents)} documents into {len(chunked_documents)} chunks")
-        return chunked_documents
\ No newline at end of file
+        return chunked_documents
+    
+    def process_directory_batches(self, directory_path: Path, batch_size: int = 64) -> Iterator[List[Document]]:
+        """
+        Process a directory of documents and yield the chunks in batches.
+        
+        Args:
+            directory_path: Path to directory containing documents
+            batch_size: Maximum number of chunks per batch
+            
+        Yields:
+            Lists of at most batch_size chunked documents
+        """
+        logger.info(f"Processing documents from {directory_path}")
+        
+        # Documents and chunks are produced lazily, so only one batch of
+        # chunks (plus the document being split) is held at a time
+        batch = []
+        chunk_count = 0
+        for chunk in self.iter_chunks(self.iter_documents_from_directory(directory_path)):
+            batch.append(chunk)
+            if len(batch) >= batch_size:
+                chunk_count += len(batch)
+                yield batch
+                batch = []
+        
+        if batch:
+            chunk_count += len(batch)
+            yield batch
+        
+        if chunk_count:
+            logger.info(f"Successfully processed {directory_path} into {chunk_count} chunks")
+        else:
+            logger.warning("No documents found to process")
@@ -0,0 +1,147 @@
+"""
+Persistent cache of document embeddings keyed by content hash.
+"""
+
+import hashlib
+import logging
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+class EmbeddingCache:
+    """SQLite-backed store of embedding vectors for previously seen texts."""
+
+    def __init__(self, db_path: Path, model_name: str, max_query_rows: int = 100_000):
+        """
+        Open (or create) the embedding cache.
+
+        Args:
+            db_path: Path to the SQLite database file
+            model_name: Embedding model name, included in every key so a
+                model change never returns stale vectors
+            max_query_rows: Maximum number of cached query vectors; the least
+                recently used are evicted beyond this
+        """
+        self.db_path = db_path
+        self.model_name = model_name
+        self.max_query_rows = max_query_rows
+        self._lock = threading.Lock()
+
+        db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(db_path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS embeddings (key TEXT PRIMARY KEY, vector BLOB NOT NULL)"
+        )
+        # User queries are unbounded input, so they live in their own table with eviction
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS queries "
+            "(key TEXT PRIMARY KEY, vector BLOB NOT NULL, last_used REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS queries_last_used ON queries (last_used)")
+        self._conn.commit()
+        self._query_rows = self._conn.execute("SELECT COUNT(*) FROM queries").fetchone()[0]
+
+    def key(self, text: str) -> str:
+        """
+        Compute the cache key for a text.
+
+        Args:
+            text: Text that is (or will be) embedded
+
+        Returns:
+            Hex digest identifying the text under the current model
+        """
+        return hashlib.sha256(f"{self.model_name}\0{text}".encode('utf-8')).hexdigest()
+
+    def get_many(self, keys: Sequence[str]) -> Dict[str, np.ndarray]:
+        """
+        Look up cached vectors.
+
+        Args:
+            keys: Cache keys from key()
+
+        Returns:
+            Mapping of found keys to their float32 vectors
+        """
+        found = {}
+        unique_keys = list(dict.fromkeys(keys))
+        with self._lock:
+            # Stay well below SQLite's bound-parameter limit
+            for start in range(0, len(unique_keys), 500):
+                batch = unique_keys[start:start + 500]
+                placeholders = ",".join("?" * len(batch))
+                rows = self._conn.execute(
+                    f"SELECT key, vector FROM embeddings WHERE key IN ({placeholders})", batch
+                ).fetchall()
+                for key, blob in rows:
+                    found[key] = np.frombuffer(blob, dtype=np.float32)
+        return found
+
+    def put_many(self, keys: Sequence[str], vectors: List[Sequence[float]]) -> None:
+        """
+        Store vectors for the given keys.
+
+        Args:
+            keys: Cache keys from key()
+            vectors: Embedding vectors, in the same order as keys
+        """
+        rows = [
+            (key, np.asarray(vector, dtype=np.float32).tobytes())
+            for key, vector in zip(keys, vectors)
+        ]
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO embeddings (key, vector) VALUES (?, ?)", rows
+            )
+            self._conn.commit()
+
+    def get_query(self, key: str) -> Optional[np.ndarray]:
+        """
+        Look up a cached query vector and mark it as recently used.
+
+        Args:
+            key: Cache key from key()
+
+        Returns:
+            The float32 vector, or None if not cached
+        """
+        with self._lock:
+            row = self._conn.execute("SELECT vector FROM queries WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            self._conn.execute("UPDATE queries SET last_used = ? WHERE key = ?", (time.time(), key))
+            self._conn.commit()
+        return np.frombuffer(row[0], dtype=np.float32)
+
+    def put_query(self, key: str, vector: Sequence[float]) -> None:
+        """
+        Store a query vector, evicting the least recently used queries over the limit.
+
+        Args:
+            key: Cache key from key()
+            vector: Query embedding
+        """
+        blob = np.asarray(vector, dtype=np.float32).tobytes()
+        with self._lock:
+            cursor = self._conn.execute(
+                "INSERT OR IGNORE INTO queries (key, vector, last_used) VALUES (?, ?, ?)",
+                (key, blob, time.time())
+            )
+            self._query_rows += cursor.rowcount
+
+            if self._query_rows > self.max_query_rows:
+                # Evict an extra tenth so eviction runs rarely
+                excess = self._query_rows - self.max_query_rows + self.max_query_rows // 10
+                self._conn.execute(
+                    "DELETE FROM queries WHERE key IN "
+                    "(SELECT key FROM queries ORDER BY last_used LIMIT ?)", (excess,)
+                )
+                self._query_rows = self._conn.execute("SELECT COUNT(*) FROM queries").fetchone()[0]
+            self._conn.commit()
@@ -0,0 +1,135 @@
+"""
+Keyword search over document chunks for the offline demo.
+"""
+
+import logging
+import math
+import re
+from collections import Counter
+from typing import List
+
+import numpy as np
+from langchain.schema import Document
+
+logger = logging.getLogger(__name__)
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+# Common English function words, which would otherwise match nearly every chunk
+STOP_WORDS = frozenset("""
+a about above after again against all am an and any are as at be because been
+before being below between both but by can could did do does doing down during
+each few for from further had has have having he her here hers herself him
+himself his how i if in into is it its itself just me more most my myself no nor
+not now of off on once only or other our ours ourselves out over own same she
+should so some such than that the their theirs them themselves then there these
+they this those through to too under until up very was we were what when where
+which while who whom why will with would you your yours yourself yourselves
+""".split())
+
+def _tokenize(text: str) -> List[str]:
+    """Split text into case-folded alphanumeric terms, dropping stop words."""
+    return [term for term in _TOKEN_RE.findall(text.casefold()) if term not in STOP_WORDS]
+
+def top_k_indices(scores: np.ndarray, k: int) -> np.ndarray:
+    """
+    Return indices of the k highest scores, best first.
+
+    Uses a linear-time partition and only sorts the selected k entries.
+    """
+    if k >= len(scores):
+        return np.argsort(-scores, kind='stable')
+    top = np.argpartition(-scores, k - 1)[:k]
+    return top[np.argsort(-scores[top], kind='stable')]
+
+class KeywordIndex:
+    """TF-IDF keyword index stored as per-term postings lists."""
+
+    def __init__(self, documents: List[Document]):
+        """
+        Build the index from a list of documents.
+
+        Args:
+            documents: Documents to index
+        """
+        self.documents = documents
+        self.vocabulary = {}
+
+        indptr = [0]
+        indices = []
+        counts = []
+        document_frequency = Counter()
+
+        for doc in documents:
+            term_counts = Counter(_tokenize(doc.page_content))
+            for term, count in term_counts.items():
+                indices.append(self.vocabulary.setdefault(term, len(self.vocabulary)))
+                counts.append(count)
+            document_frequency.update(term_counts.keys())
+            indptr.append(len(indices))
+
+        # Smoothed IDF, as in scikit-learn's TfidfVectorizer
+        n_docs = len(documents)
+        self.idf = np.ones(len(self.vocabulary), dtype=np.float32)
+        for term, term_id in self.vocabulary.items():
+            self.idf[term_id] = math.log((1 + n_docs) / (1 + document_frequency[term])) + 1
+
+        # Document-major (CSR) entries, used to normalize each document
+        indices = np.asarray(indices, dtype=np.int64)
+        rows = np.repeat(np.arange(n_docs), np.diff(indptr))
+        weights = np.asarray(counts, dtype=np.float32) * self.idf[indices]
+
+        # L2-normalize each row so scores are cosine similarities
+        norms = np.sqrt(np.bincount(rows, weights=weights ** 2, minlength=n_docs))
+        norms[norms == 0] = 1.0
+        weights = weights / norms[rows]
+
+        # Term-major postings: term t spans postings_*[term_ptr[t]:term_ptr[t + 1]]
+        order = np.argsort(indices, kind='stable')
+        self.postings_docs = rows[order]
+        self.postings_weights = weights[order].astype(np.float32)
+        self.term_ptr = np.concatenate((
+            [0], np.cumsum(np.bincount(indices, minlength=len(self.vocabulary)))
+        ))
+
+        logger.info(f"Built keyword index with {len(self.vocabulary)} terms over {n_docs} documents")
+
+    def scores(self, query: str) -> np.ndarray:
+        """
+        Score every document against a query.
+
+        Args:
+            query: Search query
+
+        Returns:
+            Array of relevance scores, one per document
+        """
+        scores = np.zeros(len(self.documents), dtype=np.float32)
+        # Only the postings of terms present in the query are touched
+        for term, count in Counter(_tokenize(query)).items():
+            term_id = self.vocabulary.get(term)
+            if term_id is None:
+                continue
+            start, end = self.term_ptr[term_id], self.term_ptr[term_id + 1]
+            scores[self.postings_docs[start:end]] += (
+                count * self.idf[term_id] * self.postings_weights[start:end]
+            )
+        return scores
+
+    def search(self, query: str, k: int = 3) -> List[Document]:
+        """
+        Return the k documents most relevant to a query.
+
+        Args:
+            query: Search query
+            k: Number of documents to return
+
+        Returns:
+            Matching documents ordered by relevance
+        """
+        if not self.documents or k <= 0:
+            return []
+
+        scores = self.scores(query)
+        top = top_k_indices(scores, k)
+        return [self.documents[i] for i in top if scores[i] > 0]
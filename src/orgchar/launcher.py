@@ -0,0 +1,38 @@
+"""
+Helpers for launching the Streamlit applications.
+"""
+
+import logging
+import subprocess
+import sys
+from pathlib import Path
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+def run_streamlit_app(app_path: Path, port: Optional[int] = None) -> None:
+    """
+    Run a Streamlit script in the current interpreter.
+
+    Bootstrapping in-process reuses modules that are already imported instead
+    of paying for a fresh interpreter and import graph. Falls back to a
+    ``streamlit run`` subprocess if the bootstrap API is unavailable.
+
+    Args:
+        app_path: Path to the Streamlit script
+        port: Optional server port
+    """
+    flag_options = {'server_port': port} if port else {}
+
+    try:
+        from streamlit.web import bootstrap
+    except ImportError:
+        logger.warning("Streamlit bootstrap API unavailable, starting a subprocess")
+        cmd = [sys.executable, "-m", "streamlit", "run", str(app_path)]
+        if port:
+            cmd.extend(["--server.port", str(port)])
+        subprocess.run(cmd)
+        return
+
+    bootstrap.load_config_options(flag_options=flag_options)
+    bootstrap.run(str(app_path), False, [], flag_options)
@@ -3,30 +3,42 @@ Local LLM implementation for OrgChar when OpenAI API is unavailable
 """
 
 import logging
+import threading
 from typing import Optional, List
 from langchain.llms import HuggingFacePipeline
 from langchain.schema import Document
 from langchain.prompts import ChatPromptTemplate
-from transformers import pipeline
+from transformers import AutoModelForSeq2SeqLM, AutoTokenizer, pipeline
 
 logger = logging.getLogger(__name__)
 
+def _accelerate_available() -> bool:
+    """Return True if accelerate is installed (needed for device_map/low_cpu_mem_usage)."""
+    try:
+        import accelerate  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
 class LocalLLMAdapter:
     """Adapter for using local LLMs with the RAG system."""
     
-    def __init__(self, model_name: str = "google/flan-t5-large"):
+    def __init__(self, model_name: str = "google/flan-t5-large", quantize: bool = True):
         """
         Initialize the local LLM adapter.
         
         Args:
             model_name: Name of the Hugging Face model to use
+            quantize: Whether to load the model with int8 weights
         """
         self.model_name = model_name
+        self.quantize = quantize
         self.pipeline = None
         self.llm = None
         
-        # Initialize the model
-        self._initialize_model()
+        # The model is loaded on first use rather than at construction
+        self._loaded = False
+        self._load_lock = threading.Lock()
         
         # Create prompt template
         self.prompt_template = ChatPromptTemplate.from_template(
@@ -47,15 +59,29 @@ Instructions:
 Answer:"""
         )
     
+    def _ensure_loaded(self):
+        """Load the local LLM on first call."""
+        if self._loaded:
+            return
+        
+        with self._load_lock:
+            if not self._loaded:
+                self._initialize_model()
+                self._loaded = True
+    
     def _initialize_model(self):
         """Initialize the local LLM."""
         try:
             logger.info(f"Loading local LLM model: {self.model_name}")
             
+            tokenizer = AutoTokenizer.from_pretrained(self.model_name)
+            model = self._load_model()
+            
             # Create HuggingFace pipeline
             self.pipeline = pipeline(
                 "text2text-generation",
-                model=self.model_name,
+                model=model,
+                tokenizer=tokenizer,
                 max_length=512
             )
             
@@ -68,6 +94,54 @@ Answer:"""
             logger.error(f"Failed to initialize local LLM: {e}")
             self.llm = None
     
+    def _load_model(self):
+        """
+        Load the seq2seq model, quantized to int8 where supported.
+        
+        Returns:
+            Loaded model
+        """
+        import torch
+        
+        if torch.cuda.is_available():
+            # 8-bit loading goes through device_map, which needs accelerate
+            if self.quantize and not _accelerate_available():
+                logger.info("accelerate not installed, loading local LLM in float16")
+            elif self.quantize:
+                try:
+                    from transformers import BitsAndBytesConfig
+                    import bitsandbytes  # noqa: F401
+                    
+                    logger.info("Loading local LLM with 8-bit weights")
+                    return AutoModelForSeq2SeqLM.from_pretrained(
+                        self.model_name,
+                        quantization_config=BitsAndBytesConfig(load_in_8bit=True),
+                        device_map="auto",
+                        low_cpu_mem_usage=True
+                    )
+                except ImportError:
+                    logger.info("bitsandbytes not installed, loading local LLM in float16")
+            
+            # Half precision halves GPU memory and bandwidth
+            if _accelerate_available():
+                return AutoModelForSeq2SeqLM.from_pretrained(
+                    self.model_name,
+                    torch_dtype=torch.float16,
+                    device_map="auto",
+                    low_cpu_mem_usage=True
+                )
+            return AutoModelForSeq2SeqLM.from_pretrained(
+                self.model_name,
+                torch_dtype=torch.float16
+            ).to("cuda")
+        
+        model = AutoModelForSeq2SeqLM.from_pretrained(self.model_name)
+        if self.quantize:
+            # Dynamic int8 quantization of the linear layers for CPU inference
+            logger.info("Quantizing local LLM linear layers to int8")
+            model = torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+        return model
+    
     def generate_answer(self, question: str, context_docs: List[Document]) -> str:
         """
         Generate an answer using the local LLM and retrieved context.
@@ -79,6 +153,8 @@ Answer:"""
         Returns:
             Generated answer
         """
+        self._ensure_loaded()
+        
         if not self.llm:
             return "Error: Local LLM not initialized properly."
         
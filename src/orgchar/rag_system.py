@@ -2,16 +2,33 @@
 RAG (Retrieval-Augmented Generation) system for organizational behavior Q&A.
 """
 
+import functools
 import logging
-from typing import List, Optional, Dict, Any
+from typing import Iterator, List, Optional, Dict, Any, Tuple
+import numpy as np
 from langchain_openai import ChatOpenAI
-from langchain.prompts import ChatPromptTemplate
-from langchain.schema import Document
-from .vector_store import VectorStore
+from langchain.schema import BaseMessage, Document, HumanMessage, SystemMessage
+from .vector_store import VectorStore, get_embeddings
+from .answer_cache import SmartAnswerCache
+from .chunk_hashes import ChunkHashSet, chunk_digest
+from .semantic_cache import SemanticAnswerCache
 from .config import Config
 
 logger = logging.getLogger(__name__)
 
+SYSTEM_PROMPT = """You are an expert in organizational behavior and management. Use the context provided with each question to answer it. Questions concern organizational behavior, workplace dynamics, leadership, or related topics.
+
+Instructions:
+1. Provide a comprehensive and accurate answer based on the context provided
+2. If the context doesn't contain enough information, clearly state what information is missing
+3. Focus on practical applications and real-world examples when relevant
+4. Cite specific concepts or frameworks from the context when applicable
+5. If no relevant context is found, provide a general response based on your knowledge of organizational behavior"""
+
+# The question precedes the retrieved context so that everything up to the
+# question stays a stable prefix for the provider's prompt cache
+USER_PROMPT_FMT = "Question: {question}\n\nContext from knowledge base:\n{context}"
+
 class RAGSystem:
     """Main RAG system for question answering using retrieved documents."""
     
@@ -24,33 +41,62 @@ class RAGSystem:
         """
         self.config = config or Config()
         
-        # Initialize components
-        self.vector_store = VectorStore(embedding_model=self.config.EMBEDDING_MODEL)
-        self.llm = ChatOpenAI(
+        # Initialize components; the embedding model is loaded once per process
+        self.embeddings = get_embeddings(self.config.EMBEDDING_MODEL, self.config.EMBEDDING_BATCH_SIZE)
+        self.vector_store = VectorStore(
+            embedding_model=self.config.EMBEDDING_MODEL,
+            cache_dir=self.config.CACHE_DIR,
+            embeddings=self.embeddings,
+            index_type=self.config.FAISS_INDEX_TYPE,
+            hnsw_m=self.config.HNSW_M,
+            ef_construction=self.config.HNSW_EF_CONSTRUCTION,
+            ef_search=self.config.HNSW_EF_SEARCH,
+            vector_dtype=self.config.FAISS_VECTOR_DTYPE
+        )
+        self._check_chunk_size()
+        
+        # Content hashes of indexed chunks, used to skip re-uploaded chunks; kept
+        # next to the index so both are persisted (and mounted) together
+        self.chunk_hashes = ChunkHashSet(self.config.VECTOR_DB_PATH / "chunk_hashes.bin")
+        
+        # Exact-match answer cache; index_version is part of the key so an
+        # answer computed against an older index is never served
+        self.index_version = 0
+        self.answer_cache = SmartAnswerCache(
+            max_entries=self.config.ANSWER_CACHE_SIZE,
+            ttl_s=self.config.ANSWER_CACHE_TTL,
+            max_bytes=self.config.ANSWER_CACHE_MAX_BYTES
+        )
+        
+        # Semantic cache for paraphrased questions
+        self.semantic_cache = SemanticAnswerCache(
+            similarity_threshold=self.config.SEMANTIC_CACHE_THRESHOLD,
+            max_entries=self.config.SEMANTIC_CACHE_SIZE
+        )
+    
+    @functools.cached_property
+    def llm(self) -> Optional[ChatOpenAI]:
+        """Chat model, created on first use; None if no OpenAI API key is configured."""
+        if not self.config.OPENAI_API_KEY:
+            return None
+        return ChatOpenAI(
             model=self.config.LLM_MODEL,
             temperature=self.config.TEMPERATURE,
             openai_api_key=self.config.OPENAI_API_KEY
-        ) if self.config.OPENAI_API_KEY else None
-        
-        # Create prompt template
-        self.prompt_template = ChatPromptTemplate.from_template(
-            """You are an expert in organizational behavior and management. Use the following context to answer the question about organizational behavior, workplace dynamics, leadership, or related topics.
-
-Context from knowledge base:
-{context}
-
-Question: {question}
-
-Instructions:
-1. Provide a comprehensive and accurate answer based on the context provided
-2. If the context doesn't contain enough information, clearly state what information is missing
-3. Focus on practical applications and real-world examples when relevant
-4. Cite specific concepts or frameworks from the context when applicable
-5. If no relevant context is found, provide a general response based on your knowledge of organizational behavior
-
-Answer:"""
         )
     
+    def _check_chunk_size(self) -> None:
+        """Warn if chunks are longer than the embedding model can encode."""
+        max_seq_length = getattr(getattr(self.embeddings, 'client', None), 'max_seq_length', None)
+        if max_seq_length and self.config.CHUNK_SIZE > max_seq_length:
+            # CHUNK_SIZE used to be measured in characters, so old .env files
+            # may still carry a value like 1000
+            logger.warning(
+                f"CHUNK_SIZE={self.config.CHUNK_SIZE} tokens exceeds the {max_seq_length}-token "
+                f"input limit of {self.config.EMBEDDING_MODEL}; the end of each chunk will be "
+                f"ignored when embedding. Lower CHUNK_SIZE (it is measured in tokens)."
+            )
+    
     def load_knowledge_base(self, force_rebuild: bool = False) -> bool:
         """
         Load or rebuild the knowledge base from documents.
@@ -65,6 +111,13 @@ Answer:"""
         
         # Try to load existing index first
         if not force_rebuild and self.vector_store.load_index(vector_db_path):
+            if not self.chunk_hashes.path.exists():
+                # Indexes saved without the sidecar would otherwise accept duplicates
+                logger.info("Rebuilding chunk hashes from the loaded index")
+                self.chunk_hashes.replace(
+                    chunk_digest(doc.page_content) for doc in self.vector_store.iter_documents()
+                )
+            self._invalidate_answer_caches()
             logger.info("Loaded existing knowledge base")
             return True
         
@@ -88,61 +141,98 @@ Answer:"""
                 chunk_overlap=self.config.CHUNK_OVERLAP
             )
             
-            documents = processor.process_directory(self.config.KNOWLEDGE_BASE_PATH)
+            batches = processor.process_directory_batches(
+                self.config.KNOWLEDGE_BASE_PATH,
+                batch_size=self.config.EMBEDDING_BATCH_SIZE
+            )
+            
+            # Record chunk hashes as the batches stream past
+            digests = []
+            def hashed(batches):
+                for batch in batches:
+                    digests.extend(chunk_digest(doc.page_content) for doc in batch)
+                    yield batch
+            
+            # Create vector index, embedding one batch of chunks per model call
+            document_count = self.vector_store.create_index_from_batches(hashed(batches))
             
-            if not documents:
+            if not document_count:
                 logger.warning("No documents found in knowledge base directory")
                 return False
             
-            # Create vector index
-            self.vector_store.create_index(documents)
-            
             # Save index
             self.vector_store.save_index(self.config.VECTOR_DB_PATH)
+            self.chunk_hashes.replace(digests)
+            self._invalidate_answer_caches()
             
-            logger.info(f"Knowledge base built with {len(documents)} document chunks")
+            logger.info(f"Knowledge base built with {document_count} document chunks")
             return True
             
         except Exception as e:
             logger.error(f"Failed to rebuild knowledge base: {e}")
             return False
     
-    def add_documents_to_knowledge_base(self, documents: List[Document]) -> bool:
+    def add_documents_to_knowledge_base(self, documents: List[Document]) -> Optional[Tuple[int, int]]:
         """
         Add new documents to the existing knowledge base.
         
+        Chunks whose content is already indexed are skipped.
+        
         Args:
             documents: List of documents to add
             
         Returns:
-            True if documents added successfully
+            Tuple of (chunks added, chunks skipped as already indexed or
+            duplicated within documents), or None if adding failed
         """
         try:
-            self.vector_store.add_documents(documents)
+            new_documents, new_digests = self.chunk_hashes.filter_new(documents)
+            skipped = len(documents) - len(new_documents)
+            if not new_documents:
+                logger.info(f"All {len(documents)} documents are already in the knowledge base")
+                return 0, skipped
+            
+            self.vector_store.add_documents(new_documents)
+            self._invalidate_answer_caches()
             self.vector_store.save_index(self.config.VECTOR_DB_PATH)
-            logger.info(f"Added {len(documents)} documents to knowledge base")
-            return True
+            self.chunk_hashes.add(new_digests)
+            logger.info(f"Added {len(new_documents)} documents to knowledge base "
+                        f"({skipped} duplicate or already indexed)")
+            return len(new_documents), skipped
         except Exception as e:
             logger.error(f"Failed to add documents: {e}")
-            return False
+            return None
     
-    def retrieve_context(self, query: str, k: int = 4) -> List[Document]:
+    def retrieve_context(self, query: str, k: int = 4,
+                         query_vector: Optional[np.ndarray] = None) -> List[Document]:
         """
         Retrieve relevant context documents for a query.
         
         Args:
             query: User question or query
             k: Number of documents to retrieve
+            query_vector: Precomputed query embedding, if available
             
         Returns:
             List of relevant documents
         """
         try:
-            return self.vector_store.similarity_search(query, k=k)
+            return self.vector_store.similarity_search(query, k=k, query_vector=query_vector)
         except Exception as e:
             logger.error(f"Failed to retrieve context: {e}")
             return []
     
+    def _build_messages(self, question: str, context_docs: List[Document]) -> List[BaseMessage]:
+        """Build the chat messages for a question and its retrieved context."""
+        context = "\n\n".join([
+            f"Source: {doc.metadata.get('filename', 'Unknown')}\n{doc.page_content}"
+            for doc in context_docs
+        ])
+        return [
+            SystemMessage(content=SYSTEM_PROMPT),
+            HumanMessage(content=USER_PROMPT_FMT.format(question=question, context=context))
+        ]
+    
     def generate_answer(self, question: str, context_docs: List[Document]) -> str:
         """
         Generate an answer using the LLM and retrieved context.
@@ -158,25 +248,74 @@ Answer:"""
             return "Error: OpenAI API key not configured. Please set OPENAI_API_KEY in your environment."
         
         try:
-            # Prepare context
-            context = "\n\n".join([
-                f"Source: {doc.metadata.get('filename', 'Unknown')}\n{doc.page_content}"
-                for doc in context_docs
-            ])
-            
-            # Generate response
-            messages = self.prompt_template.format_messages(
-                context=context,
-                question=question
-            )
-            
-            response = self.llm(messages)
+            response = self.llm.invoke(self._build_messages(question, context_docs))
             return response.content
             
         except Exception as e:
             logger.error(f"Failed to generate answer: {e}")
             return f"Error generating answer: {str(e)}"
     
+    def _stream_answer(self, question: str, context_docs: List[Document]) -> Iterator[str]:
+        """Stream the answer text, letting LLM errors propagate to the caller."""
+        if not self.llm:
+            yield "Error: OpenAI API key not configured. Please set OPENAI_API_KEY in your environment."
+            return
+        
+        for chunk in self.llm.stream(self._build_messages(question, context_docs)):
+            if chunk.content:
+                yield chunk.content
+    
+    def _lookup_cached_answer(self, question: str, retrieve_k: int) -> Tuple[Optional[Dict[str, Any]], str, Optional[np.ndarray]]:
+        """
+        Look a question up in the exact and semantic answer caches.
+        
+        The question is embedded once here; the same vector serves the
+        semantic cache and, on a miss, the vector search.
+        
+        Returns:
+            Tuple of (cached response or None, exact cache key, question
+            embedding or None if the exact cache hit)
+        """
+        cache_key = SmartAnswerCache.make_key(
+            question, retrieve_k, self.config.LLM_MODEL, self.index_version
+        )
+        cached = self.answer_cache.get(cache_key)
+        if cached is not None:
+            logger.debug(f"Answer cache hit for question: {question[:50]}...")
+            cached['question'] = question
+            return cached, cache_key, None
+        
+        # Serve paraphrases of previously answered questions
+        question_vector = self.vector_store.embed_query(question)
+        cached = self.semantic_cache.lookup(SemanticAnswerCache.normalize(question_vector), retrieve_k)
+        if cached is not None:
+            cached['question'] = question
+        return cached, cache_key, question_vector
+    
+    def _store_answer(self, cache_key: str, question_vector: np.ndarray, retrieve_k: int,
+                      response: Dict[str, Any]) -> None:
+        """Cache a response unless it is an error message."""
+        if not response['answer'].startswith("Error"):
+            self.answer_cache.put(cache_key, response, size=len(response['answer']))
+            self.semantic_cache.add(SemanticAnswerCache.normalize(question_vector), retrieve_k, response)
+    
+    @staticmethod
+    def _collect_sources(context_docs: List[Document]) -> List[Dict[str, Any]]:
+        """Describe the distinct source chunks of the retrieved context."""
+        sources = []
+        seen_sources = set()
+        for doc in context_docs:
+            source_info = {
+                'filename': doc.metadata.get('filename', 'Unknown'),
+                'type': doc.metadata.get('type', 'Unknown'),
+                'chunk_id': doc.metadata.get('chunk_id', 0)
+            }
+            source_key = (source_info['filename'], source_info['type'], source_info['chunk_id'])
+            if source_key not in seen_sources:
+                seen_sources.add(source_key)
+                sources.append(source_info)
+        return sources
+    
     def answer_question(self, question: str, retrieve_k: int = 4) -> Dict[str, Any]:
         """
         Complete RAG pipeline: retrieve context and generate answer.
@@ -189,30 +328,27 @@ Answer:"""
             Dictionary containing answer and metadata
         """
         try:
+            cached, cache_key, question_vector = self._lookup_cached_answer(question, retrieve_k)
+            if cached is not None:
+                return cached
+            
             # Retrieve context
-            context_docs = self.retrieve_context(question, k=retrieve_k)
+            context_docs = self.retrieve_context(question, k=retrieve_k, query_vector=question_vector)
             
             # Generate answer
             answer = self.generate_answer(question, context_docs)
             
             # Prepare response
-            sources = []
-            for doc in context_docs:
-                source_info = {
-                    'filename': doc.metadata.get('filename', 'Unknown'),
-                    'type': doc.metadata.get('type', 'Unknown'),
-                    'chunk_id': doc.metadata.get('chunk_id', 0)
-                }
-                if source_info not in sources:
-                    sources.append(source_info)
-            
-            return {
+            response = {
                 'answer': answer,
-                'sources': sources,
+                'sources': self._collect_sources(context_docs),
                 'context_count': len(context_docs),
                 'question': question
             }
             
+            self._store_answer(cache_key, question_vector, retrieve_k, response)
+            return response
+            
         except Exception as e:
             logger.error(f"Failed to answer question: {e}")
             return {
@@ -222,6 +358,68 @@ Answer:"""
                 'question': question
             }
     
+    def answer_question_stream(self, question: str, retrieve_k: int = 4) -> Tuple[Dict[str, Any], Iterator[str]]:
+        """
+        RAG pipeline that streams the answer text as it is generated.
+        
+        Retrieval happens up front so the sources are known immediately; the
+        response's 'answer' is filled in (and cached) once the returned
+        iterator is exhausted.
+        
+        Args:
+            question: User question
+            retrieve_k: Number of context documents to retrieve
+            
+        Returns:
+            Tuple of (response dictionary, iterator over answer text)
+        """
+        try:
+            cached, cache_key, question_vector = self._lookup_cached_answer(question, retrieve_k)
+            if cached is not None:
+                return cached, iter([cached['answer']])
+            
+            context_docs = self.retrieve_context(question, k=retrieve_k, query_vector=question_vector)
+        except Exception as e:
+            logger.error(f"Failed to answer question: {e}")
+            response = {
+                'answer': f"Error processing question: {str(e)}",
+                'sources': [],
+                'context_count': 0,
+                'question': question
+            }
+            return response, iter([response['answer']])
+        
+        response = {
+            'answer': "",
+            'sources': self._collect_sources(context_docs),
+            'context_count': len(context_docs),
+            'question': question
+        }
+        
+        def stream() -> Iterator[str]:
+            parts = []
+            try:
+                for piece in self._stream_answer(question, context_docs):
+                    parts.append(piece)
+                    yield piece
+            except Exception as e:
+                # A partial answer must not be cached
+                logger.error(f"Failed to generate answer: {e}")
+                error = f"Error generating answer: {str(e)}"
+                response['answer'] = "".join(parts + [error])
+                yield error
+                return
+            response['answer'] = "".join(parts)
+            self._store_answer(cache_key, question_vector, retrieve_k, response)
+        
+        return response, stream()
+    
+    def _invalidate_answer_caches(self) -> None:
+        """Invalidate cached answers after the knowledge base changes."""
+        self.index_version += 1
+        self.answer_cache.clear()
+        self.semantic_cache.clear()
+    
     def get_knowledge_base_stats(self) -> Dict[str, Any]:
         """
         Get statistics about the current knowledge base.
@@ -239,4 +437,19 @@ Answer:"""
             True if update successful
         """
         logger.info("Updating knowledge base...")
-        return self._rebuild_knowledge_base()
\ No newline at end of file
+        return self._rebuild_knowledge_base()
+
+@functools.lru_cache(maxsize=1)
+def get_rag_system() -> RAGSystem:
+    """
+    Get the process-wide RAG system with its knowledge base loaded.
+    
+    The embedding model and vector index are loaded on first call and shared
+    by every caller (CLI commands, Streamlit sessions) afterwards.
+    
+    Returns:
+        Shared RAGSystem instance
+    """
+    rag_system = RAGSystem(Config())
+    rag_system.load_knowledge_base()
+    return rag_system
\ No newline at end of file
@@ -0,0 +1,113 @@
+"""
+Semantic answer cache that matches paraphrased questions by embedding similarity.
+"""
+
+import copy
+import logging
+import threading
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+class SemanticAnswerCache:
+    """Caches RAG responses and serves them for sufficiently similar questions."""
+
+    def __init__(self, similarity_threshold: float = 0.95, max_entries: int = 256):
+        """
+        Initialize the semantic cache.
+
+        Args:
+            similarity_threshold: Minimum cosine similarity for a cache hit
+            max_entries: Maximum number of cached questions
+        """
+        self.similarity_threshold = similarity_threshold
+        self.max_entries = max_entries
+
+        self._vectors: Optional[np.ndarray] = None
+        self._retrieve_k: List[int] = []
+        self._responses: List[Dict[str, Any]] = []
+        self._last_used: List[int] = []
+        self._clock = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def normalize(vector) -> np.ndarray:
+        """
+        Scale an embedding to unit length.
+
+        Args:
+            vector: Question embedding
+
+        Returns:
+            Normalized float32 vector
+        """
+        vector = np.asarray(vector, dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm > 0 else vector
+
+    def lookup(self, vector: np.ndarray, retrieve_k: int) -> Optional[Dict[str, Any]]:
+        """
+        Find a cached response for a similar question.
+
+        Args:
+            vector: Normalized question embedding from normalize()
+            retrieve_k: Number of context documents the caller asked for
+
+        Returns:
+            Copy of the cached response, or None on a miss
+        """
+        with self._lock:
+            if self._vectors is None:
+                return None
+
+            similarities = self._vectors[:len(self._responses)] @ vector
+            # Only consider entries answered with the same retrieval depth
+            candidates = [i for i, k in enumerate(self._retrieve_k) if k == retrieve_k]
+            if not candidates:
+                return None
+
+            best = max(candidates, key=lambda i: similarities[i])
+            if similarities[best] < self.similarity_threshold:
+                return None
+
+            self._clock += 1
+            self._last_used[best] = self._clock
+            logger.debug(f"Semantic cache hit with similarity {similarities[best]:.3f}")
+            return copy.deepcopy(self._responses[best])
+
+    def add(self, vector: np.ndarray, retrieve_k: int, response: Dict[str, Any]) -> None:
+        """
+        Store a response, evicting the least recently used entry when full.
+
+        Args:
+            vector: Normalized question embedding from normalize()
+            retrieve_k: Number of context documents used for the response
+            response: RAG response dictionary
+        """
+        with self._lock:
+            if self._vectors is None:
+                self._vectors = np.empty((self.max_entries, len(vector)), dtype=np.float32)
+
+            self._clock += 1
+            if len(self._responses) < self.max_entries:
+                slot = len(self._responses)
+                self._retrieve_k.append(retrieve_k)
+                self._responses.append(copy.deepcopy(response))
+                self._last_used.append(self._clock)
+            else:
+                slot = int(np.argmin(self._last_used))
+                self._retrieve_k[slot] = retrieve_k
+                self._responses[slot] = copy.deepcopy(response)
+                self._last_used[slot] = self._clock
+
+            self._vectors[slot] = vector
+
+    def clear(self) -> None:
+        """Remove all cached responses."""
+        with self._lock:
+            self._vectors = None
+            self._retrieve_k = []
+            self._responses = []
+            self._last_used = []
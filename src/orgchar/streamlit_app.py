@@ -4,16 +4,16 @@ Streamlit web interface for the OrgChar RAG chatbot.
 
 import streamlit as st
 import logging
-from pathlib import Path
-from typing import Dict, Any
-import sys
 import os
-
-# Add src to path for imports
-sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+import shutil
+import tempfile
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+from typing import Dict, Any, List
+from langchain.schema import Document
 
 from orgchar.config import Config
-from orgchar.rag_system import RAGSystem
+from orgchar.rag_system import RAGSystem, get_rag_system
 from orgchar.document_processor import DocumentProcessor
 
 # Configure logging
@@ -28,6 +28,44 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
+@st.cache_resource(show_spinner="Loading knowledge base...")
+def load_rag_system() -> RAGSystem:
+    """Load the RAG system once per process and share it across sessions."""
+    return get_rag_system()
+
+@st.fragment
+def render_chat_history(window: int):
+    """
+    Render past chat turns as a fragment so it can rerun independently.
+    
+    Only the most recent turns are rendered until the user asks for the rest.
+    
+    Args:
+        window: Number of most recent turns to show by default
+    """
+    history = st.session_state.chat_history
+    
+    if len(history) > window and not st.session_state.get('show_full_history', False):
+        if st.button(f"Show {len(history) - window} earlier messages"):
+            st.session_state.show_full_history = True
+            st.rerun(scope="fragment")
+        history = history[-window:]
+    
+    for question, answer, sources in history:
+        # Question
+        with st.chat_message("user"):
+            st.write(question)
+        
+        # Answer
+        with st.chat_message("assistant"):
+            st.write(answer)
+            
+            # Show sources if available
+            if sources:
+                with st.expander("📚 Sources"):
+                    for source in sources:
+                        st.write(f"• **{source['filename']}** ({source['type']})")
+
 class StreamlitApp:
     """Main Streamlit application class."""
     
@@ -36,10 +74,9 @@ class StreamlitApp:
         self.config = Config()
         self.config.ensure_directories()
         
-        # Initialize RAG system
-        if 'rag_system' not in st.session_state:
-            st.session_state.rag_system = RAGSystem(self.config)
-            st.session_state.rag_system.load_knowledge_base()
+        # RAG system is a process-wide resource; only per-user chat state
+        # lives in session_state
+        self.rag_system = load_rag_system()
         
         # Initialize chat history
         if 'chat_history' not in st.session_state:
@@ -53,7 +90,7 @@ class StreamlitApp:
         st.sidebar.subheader("📚 Knowledge Base")
         
         # Display knowledge base stats
-        stats = st.session_state.rag_system.get_knowledge_base_stats()
+        stats = self.rag_system.get_knowledge_base_stats()
         
         if stats['status'] == 'initialized':
             st.sidebar.success(f"✅ {stats['document_count']} documents indexed")
@@ -102,13 +139,14 @@ class StreamlitApp:
         # Clear chat history
         if st.sidebar.button("🗑️ Clear Chat History"):
             st.session_state.chat_history = []
+            st.session_state.show_full_history = False
             st.rerun()
     
     def _refresh_knowledge_base(self):
         """Refresh the knowledge base from documents."""
         with st.spinner("Refreshing knowledge base..."):
             st.sidebar.text("Refreshing knowledge base...")
-            success = st.session_state.rag_system.update_knowledge_base()
+            success = self.rag_system.update_knowledge_base()
             if success:
                 st.sidebar.success("Knowledge base refreshed!")
             else:
@@ -117,9 +155,51 @@ class StreamlitApp:
     
     def _show_kb_stats(self):
         """Show knowledge base statistics."""
-        stats = st.session_state.rag_system.get_knowledge_base_stats()
+        stats = self.rag_system.get_knowledge_base_stats()
         st.sidebar.json(stats)
     
+    def _parse_uploaded_file(self, uploaded_file, processor: DocumentProcessor) -> List[Document]:
+        """
+        Parse and chunk one uploaded file.
+        
+        Args:
+            uploaded_file: Streamlit UploadedFile
+            processor: Document processor used for loading and chunking
+            
+        Returns:
+            Chunked documents for the file
+        """
+        # Stream the upload to a unique temp file instead of copying it into memory
+        fd, temp_name = tempfile.mkstemp(suffix=Path(uploaded_file.name).suffix)
+        temp_path = Path(temp_name)
+        
+        try:
+            with os.fdopen(fd, "wb") as f:
+                uploaded_file.seek(0)
+                shutil.copyfileobj(uploaded_file, f, length=1024 * 1024)
+            
+            # Process based on file type
+            if uploaded_file.type == "application/pdf":
+                content = processor.load_pdf(temp_path)
+            else:
+                content = processor.load_text_file(temp_path)
+            
+            # Create document
+            doc = Document(
+                page_content=content,
+                metadata={
+                    'source': uploaded_file.name,
+                    'filename': uploaded_file.name,
+                    'type': uploaded_file.name.split('.')[-1].upper()
+                }
+            )
+            
+            # Chunk document
+            return processor.chunk_documents([doc])
+        finally:
+            # Clean up temp file
+            temp_path.unlink(missing_ok=True)
+    
     def _process_uploaded_files(self, uploaded_files):
         """Process and add uploaded files to knowledge base."""
         try:
@@ -132,47 +212,40 @@ class StreamlitApp:
             
             with st.spinner(f"Processing {len(uploaded_files)} files..."):
                 st.sidebar.text(f"Processing {len(uploaded_files)} files...")
-                for uploaded_file in uploaded_files:
-                    # Save uploaded file temporarily
-                    temp_path = Path("/tmp") / uploaded_file.name
-                    with open(temp_path, "wb") as f:
-                        f.write(uploaded_file.getvalue())
-                    
-                    # Process based on file type
-                    try:
-                        if uploaded_file.type == "application/pdf":
-                            content = processor.load_pdf(temp_path)
-                        else:
-                            content = processor.load_text_file(temp_path)
-                        
-                        # Create document
-                        from langchain.schema import Document
-                        doc = Document(
-                            page_content=content,
-                            metadata={
-                                'source': uploaded_file.name,
-                                'filename': uploaded_file.name,
-                                'type': uploaded_file.name.split('.')[-1].upper()
-                            }
-                        )
-                        
-                        # Chunk document
-                        chunks = processor.chunk_documents([doc])
-                        all_documents.extend(chunks)
-                        
-                        # Clean up temp file
-                        temp_path.unlink()
-                        
-                    except Exception as e:
-                        st.sidebar.error(f"Error processing {uploaded_file.name}: {e}")
+                progress = st.sidebar.progress(0.0)
+                
+                # Parse files concurrently; Streamlit calls stay on the script thread
+                with ThreadPoolExecutor(max_workers=min(8, len(uploaded_files))) as executor:
+                    futures = {
+                        executor.submit(self._parse_uploaded_file, uploaded_file, processor): i
+                        for i, uploaded_file in enumerate(uploaded_files)
+                    }
+                    results = [[] for _ in uploaded_files]
+                    for done, future in enumerate(as_completed(futures), start=1):
+                        i = futures[future]
+                        try:
+                            results[i] = future.result()
+                        except Exception as e:
+                            st.sidebar.error(f"Error processing {uploaded_files[i].name}: {e}")
+                        progress.progress(done / len(futures))
+                
+                # Keep the upload order
+                for chunks in results:
+                    all_documents.extend(chunks)
             
-            # Add to knowledge base
+            # Add to knowledge base; chunks that are already indexed are skipped
             if all_documents:
-                success = st.session_state.rag_system.add_documents_to_knowledge_base(all_documents)
-                if success:
-                    st.sidebar.success(f"Added {len(all_documents)} document chunks to knowledge base!")
-                else:
+                result = self.rag_system.add_documents_to_knowledge_base(all_documents)
+                if result is None:
                     st.sidebar.error("Failed to add documents to knowledge base")
+                elif result[0] == 0:
+                    st.sidebar.info("All uploaded content is already in the knowledge base.")
+                else:
+                    added, skipped = result
+                    message = f"Added {added} document chunks to knowledge base!"
+                    if skipped:
+                        message += f" Skipped {skipped} duplicate/already-indexed chunks."
+                    st.sidebar.success(message)
             
         except Exception as e:
             st.sidebar.error(f"Error processing files: {e}")
@@ -186,20 +259,7 @@ class StreamlitApp:
         chat_container = st.container()
         
         with chat_container:
-            for i, (question, answer, sources) in enumerate(st.session_state.chat_history):
-                # Question
-                with st.chat_message("user"):
-                    st.write(question)
-                
-                # Answer
-                with st.chat_message("assistant"):
-                    st.write(answer)
-                    
-                    # Show sources if available
-                    if sources:
-                        with st.expander("📚 Sources"):
-                            for source in sources:
-                                st.write(f"• **{source['filename']}** ({source['type']})")
+            render_chat_history(self.config.CHAT_HISTORY_WINDOW)
         
         # Chat input
         question = st.chat_input("Ask a question about organizational behavior...")
@@ -217,13 +277,13 @@ class StreamlitApp:
         with st.chat_message("assistant"):
             with st.spinner("Thinking..."):
                 retrieve_k = getattr(st.session_state, 'retrieve_k', 4)
-                response = st.session_state.rag_system.answer_question(
+                response, answer_stream = self.rag_system.answer_question_stream(
                     question, 
                     retrieve_k=retrieve_k
                 )
             
-            # Display answer
-            st.write(response['answer'])
+            # Display answer as it is generated
+            st.write_stream(answer_stream)
             
             # Display sources
             if response['sources']:
@@ -237,8 +297,6 @@ class StreamlitApp:
                 response['answer'],
                 response['sources']
             ))
-        
-        st.rerun()
     
     def render_footer(self):
         """Render footer information."""
@@ -2,29 +2,133 @@
 Vector store module for managing document embeddings and similarity search.
 """
 
+import functools
+import json
 import logging
-import pickle
 from pathlib import Path
-from typing import List, Tuple, Optional
+from typing import Iterable, Iterator, List, Tuple, Optional
+import numpy as np
 from langchain_community.embeddings import SentenceTransformerEmbeddings
+from langchain_community.docstore.in_memory import InMemoryDocstore
 from langchain_community.vectorstores import FAISS
+from langchain_community.vectorstores.faiss import dependable_faiss_import
+from langchain_community.vectorstores.utils import DistanceStrategy
 from langchain.schema import Document
+from langchain.schema.embeddings import Embeddings
+from .embedding_cache import EmbeddingCache
 
 logger = logging.getLogger(__name__)
 
+def _normalize_rows(vectors: np.ndarray) -> np.ndarray:
+    """Scale each row of a float32 matrix (or a single vector) to unit length in place."""
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    norms[norms == 0] = 1.0
+    vectors /= norms
+    return vectors
+
+@functools.lru_cache(maxsize=None)
+def _load_embeddings(model_name: str) -> SentenceTransformerEmbeddings:
+    """Load the embedding model; cached so each model is loaded once per process."""
+    logger.info(f"Loading embedding model: {model_name}")
+    embeddings = SentenceTransformerEmbeddings(
+        model_name=model_name,
+        encode_kwargs={'batch_size': 64, 'normalize_embeddings': True}
+    )
+    
+    # Half-precision weights halve memory traffic for the encoder on GPU
+    if str(embeddings.client.device).startswith('cuda'):
+        embeddings.client.half()
+    
+    return embeddings
+
+def get_embeddings(model_name: str, batch_size: Optional[int] = None) -> SentenceTransformerEmbeddings:
+    """
+    Get the process-wide embedding model for a model name.
+    
+    Args:
+        model_name: Name of the sentence transformer model
+        batch_size: Number of texts per encoder forward pass; the shared
+            instance keeps its current batch size if not given
+        
+    Returns:
+        Shared embeddings instance, loaded on first call
+    """
+    embeddings = _load_embeddings(model_name)
+    if batch_size is not None:
+        embeddings.encode_kwargs['batch_size'] = batch_size
+    return embeddings
+
 class VectorStore:
     """Manages document embeddings and similarity search using FAISS."""
     
-    def __init__(self, embedding_model: str = "sentence-transformers/all-MiniLM-L6-v2"):
+    def __init__(self, embedding_model: str = "sentence-transformers/all-MiniLM-L6-v2",
+                 cache_dir: Optional[Path] = None, embeddings: Optional[Embeddings] = None,
+                 index_type: str = "hnsw", hnsw_m: int = 32, ef_construction: int = 200,
+                 ef_search: int = 64, vector_dtype: str = "float16"):
         """
         Initialize the vector store.
         
         Args:
             embedding_model: Name of the sentence transformer model to use
+            cache_dir: Directory for the persistent embedding cache; caching
+                is disabled if not given
+            embeddings: Embedding model to use; defaults to the shared
+                instance for embedding_model
+            index_type: "hnsw" for an approximate HNSW graph index, or "flat"
+                for exact brute-force search
+            hnsw_m: Number of graph neighbours per vector (HNSW only)
+            ef_construction: Candidate list size while building (HNSW only)
+            ef_search: Candidate list size while searching; higher trades
+                speed for recall (HNSW only)
+            vector_dtype: "float16" to store vectors at half precision in the
+                index, or "float32" for full precision
         """
         self.embedding_model = embedding_model
-        self.embeddings = SentenceTransformerEmbeddings(model_name=embedding_model)
+        self.index_type = index_type
+        self.hnsw_m = hnsw_m
+        self.ef_construction = ef_construction
+        self.ef_search = ef_search
+        self.vector_dtype = vector_dtype
+        self.embeddings = embeddings or get_embeddings(embedding_model)
         self.vector_store: Optional[FAISS] = None
+        self.embedding_cache = (
+            EmbeddingCache(cache_dir / "embeddings.sqlite3", embedding_model)
+            if cache_dir is not None else None
+        )
+        
+        # Repeated queries skip the encoder entirely; the in-memory LRU sits in
+        # front of the persistent embedding cache, which survives restarts
+        self._embed_query_cached = functools.lru_cache(maxsize=1024)(self._encode_query)
+    
+    def _encode_query(self, query: str) -> tuple:
+        """
+        Encode a query, consulting the persistent embedding cache first.
+        
+        Returns an immutable tuple so values held by the in-memory cache stay unchanged.
+        """
+        if self.embedding_cache is None:
+            return tuple(self.embeddings.embed_query(query))
+        
+        key = self.embedding_cache.key(query)
+        cached = self.embedding_cache.get_query(key)
+        if cached is not None:
+            return tuple(cached.tolist())
+        
+        vector = self.embeddings.embed_query(query)
+        self.embedding_cache.put_query(key, vector)
+        return tuple(vector)
+    
+    def embed_query(self, query: str) -> np.ndarray:
+        """
+        Embed a search query, memoizing recent queries.
+        
+        Args:
+            query: Search query
+            
+        Returns:
+            Unit-length float32 query vector
+        """
+        return _normalize_rows(np.array(self._embed_query_cached(query.strip()), dtype=np.float32))
         
     def create_index(self, documents: List[Document]) -> None:
         """
@@ -38,16 +142,7 @@ class VectorStore:
             return
         
         logger.info(f"Creating vector index for {len(documents)} documents")
-        
-        try:
-            self.vector_store = FAISS.from_documents(
-                documents=documents,
-                embedding=self.embeddings
-            )
-            logger.info("Vector index created successfully")
-        except Exception as e:
-            logger.error(f"Failed to create vector index: {e}")
-            raise
+        self.create_index_from_batches([documents])
     
     def add_documents(self, documents: List[Document]) -> None:
         """
@@ -65,21 +160,164 @@ class VectorStore:
             self.create_index(documents)
             return
         
+        logger.info(f"Adding {len(documents)} documents to existing index")
+        self.add_documents_batched(documents)
+        logger.info("Documents added successfully")
+    
+    def _embed_documents(self, texts: List[str]) -> np.ndarray:
+        """
+        Embed texts, reusing cached vectors and embedding only the misses.
+        
+        Args:
+            texts: Texts to embed
+            
+        Returns:
+            float32 matrix with one unit-length embedding row per text, in order
+        """
+        if self.embedding_cache is None:
+            return _normalize_rows(np.array(self.embeddings.embed_documents(texts), dtype=np.float32))
+        
+        keys = [self.embedding_cache.key(text) for text in texts]
+        cached = self.embedding_cache.get_many(keys)
+        
+        missing = [i for i, key in enumerate(keys) if key not in cached]
+        new_vectors = None
+        if missing:
+            new_vectors = np.asarray(
+                self.embeddings.embed_documents([texts[i] for i in missing]), dtype=np.float32
+            )
+            self.embedding_cache.put_many([keys[i] for i in missing], new_vectors)
+        
+        # Fill one preallocated matrix in place instead of stacking row lists
+        dim = new_vectors.shape[1] if new_vectors is not None else len(next(iter(cached.values())))
+        matrix = np.empty((len(texts), dim), dtype=np.float32)
+        if new_vectors is not None:
+            matrix[missing] = new_vectors
+        for i, key in enumerate(keys):
+            vector = cached.get(key)
+            if vector is not None:
+                matrix[i] = vector
+        
+        logger.debug(f"Embedded {len(missing)} of {len(texts)} texts ({len(texts) - len(missing)} cached)")
+        return _normalize_rows(matrix)
+    
+    def _new_store(self, dimension: int) -> FAISS:
+        """
+        Create an empty FAISS store with the configured index type.
+        
+        Args:
+            dimension: Embedding dimension
+            
+        Returns:
+            Empty FAISS store
+        """
+        faiss = dependable_faiss_import()
+        half = self.vector_dtype == "float16"
+        
+        # Vectors are unit length, so inner product ranks exactly like cosine
+        # similarity with a single dot product per comparison
+        metric = faiss.METRIC_INNER_PRODUCT
+        
+        if self.index_type == "hnsw":
+            if half:
+                index = faiss.IndexHNSWSQ(dimension, faiss.ScalarQuantizer.QT_fp16, self.hnsw_m, metric)
+            else:
+                index = faiss.IndexHNSWFlat(dimension, self.hnsw_m, metric)
+            index.hnsw.efConstruction = self.ef_construction
+            index.hnsw.efSearch = self.ef_search
+        elif half:
+            index = faiss.IndexScalarQuantizer(dimension, faiss.ScalarQuantizer.QT_fp16, metric)
+        else:
+            index = faiss.IndexFlatIP(dimension)
+        
+        return FAISS(
+            embedding_function=self.embeddings,
+            index=index,
+            docstore=InMemoryDocstore(),
+            index_to_docstore_id={},
+            distance_strategy=DistanceStrategy.MAX_INNER_PRODUCT
+        )
+    
+    def _add_batch(self, store: Optional[FAISS], documents: List[Document]) -> FAISS:
+        """
+        Embed a batch of documents with one model call and add it to a store.
+        
+        Args:
+            store: Existing FAISS store, or None to create a new one
+            documents: Documents to embed and add
+            
+        Returns:
+            The store containing the new documents
+        """
+        texts = [doc.page_content for doc in documents]
+        metadatas = [doc.metadata for doc in documents]
+        vectors = self._embed_documents(texts)
+        
+        if store is None:
+            store = self._new_store(vectors.shape[1])
+        
+        store.add_embeddings(list(zip(texts, vectors)), metadatas=metadatas)
+        return store
+    
+    def add_documents_batched(self, documents: List[Document]) -> None:
+        """
+        Embed a batch of documents in a single call and add them to the index.
+        
+        Args:
+            documents: Batch of documents to add
+        """
+        if not documents:
+            return
+        
+        try:
+            self.vector_store = self._add_batch(self.vector_store, documents)
+            logger.debug(f"Added batch of {len(documents)} documents")
+        except Exception as e:
+            logger.error(f"Failed to add document batch: {e}")
+            raise
+    
+    def create_index_from_batches(self, batches: Iterable[List[Document]]) -> int:
+        """
+        Create a new vector index from batches of documents.
+        
+        The current index is only replaced once every batch has been embedded.
+        
+        Args:
+            batches: Iterable of document batches
+            
+        Returns:
+            Number of documents indexed
+        """
+        store = None
+        document_count = 0
+        
         try:
-            logger.info(f"Adding {len(documents)} documents to existing index")
-            self.vector_store.add_documents(documents)
-            logger.info("Documents added successfully")
+            for batch in batches:
+                if batch:
+                    store = self._add_batch(store, batch)
+                    document_count += len(batch)
         except Exception as e:
-            logger.error(f"Failed to add documents: {e}")
+            logger.error(f"Failed to create vector index: {e}")
             raise
+        
+        if store is None:
+            logger.warning("No documents provided for indexing")
+            return 0
+        
+        self.vector_store = store
+        logger.info(f"Vector index created with {document_count} documents")
+        return document_count
     
-    def similarity_search(self, query: str, k: int = 4) -> List[Document]:
+    def similarity_search(self, query: str, k: int = 4,
+                          query_vector: Optional[np.ndarray] = None) -> List[Document]:
         """
         Perform similarity search on the vector store.
         
         Args:
             query: Search query
             k: Number of similar documents to return
+            query_vector: Precomputed embedding of query from embed_query(),
+                to avoid encoding it again
             
         Returns:
             List of similar documents
@@ -89,20 +327,25 @@ class VectorStore:
             return []
         
         try:
-            results = self.vector_store.similarity_search(query, k=k)
+            if query_vector is None:
+                query_vector = self.embed_query(query)
+            results = self.vector_store.similarity_search_by_vector(query_vector, k=k)
             logger.debug(f"Found {len(results)} similar documents for query: {query[:50]}...")
             return results
         except Exception as e:
             logger.error(f"Similarity search failed: {e}")
             return []
     
-    def similarity_search_with_score(self, query: str, k: int = 4) -> List[Tuple[Document, float]]:
+    def similarity_search_with_score(self, query: str, k: int = 4,
+                                     query_vector: Optional[np.ndarray] = None) -> List[Tuple[Document, float]]:
         """
         Perform similarity search with relevance scores.
         
         Args:
             query: Search query
             k: Number of similar documents to return
+            query_vector: Precomputed embedding of query from embed_query(),
+                to avoid encoding it again
             
         Returns:
             List of tuples containing documents and their similarity scores
@@ -112,13 +355,31 @@ class VectorStore:
             return []
         
         try:
-            results = self.vector_store.similarity_search_with_score(query, k=k)
+            if query_vector is None:
+                query_vector = self.embed_query(query)
+            results = self.vector_store.similarity_search_with_score_by_vector(query_vector, k=k)
             logger.debug(f"Found {len(results)} similar documents with scores for query: {query[:50]}...")
             return results
         except Exception as e:
             logger.error(f"Similarity search with score failed: {e}")
             return []
     
+    def iter_documents(self) -> Iterator[Document]:
+        """
+        Iterate over the documents stored in the index.
+        
+        Yields:
+            Indexed documents, in index order
+        """
+        if self.vector_store is None:
+            return
+        
+        docstore = self.vector_store.docstore
+        for doc_id in self.vector_store.index_to_docstore_id.values():
+            doc = docstore.search(doc_id)
+            if isinstance(doc, Document):
+                yield doc
+    
     def save_index(self, file_path: Path) -> None:
         """
         Save the vector store to disk.
@@ -138,15 +399,17 @@ class VectorStore:
             self.vector_store.save_local(str(faiss_path))
             
             # Save metadata
-            metadata_path = file_path / "metadata.pkl"
+            metadata_path = file_path / "metadata.json"
+            document_count = self.vector_store.index.ntotal
             metadata = {
                 'embedding_model': self.embedding_model,
-                'document_count': len(self.vector_store.docstore._dict)
+                'document_count': document_count,
+                'distance_strategy': self.vector_store.distance_strategy.value
             }
-            with open(metadata_path, 'wb') as f:
-                pickle.dump(metadata, f)
+            with open(metadata_path, 'w', encoding='utf-8') as f:
+                json.dump(metadata, f)
             
-            logger.info(f"Vector store saved to {file_path}")
+            logger.info(f"Vector store saved to {file_path} with {document_count} documents")
         except Exception as e:
             logger.error(f"Failed to save vector store: {e}")
             raise
@@ -162,28 +425,45 @@ class VectorStore:
             True if loaded successfully, False otherwise
         """
         faiss_path = file_path / "faiss_index"
-        metadata_path = file_path / "metadata.pkl"
+        metadata_path = file_path / "metadata.json"
+        legacy_metadata_path = file_path / "metadata.pkl"
         
-        if not faiss_path.exists() or not metadata_path.exists():
+        if not faiss_path.exists() or not (metadata_path.exists() or legacy_metadata_path.exists()):
             logger.warning(f"Vector store files not found at {file_path}")
             return False
         
         try:
-            # Load metadata
-            with open(metadata_path, 'rb') as f:
-                metadata = pickle.load(f)
+            # Load metadata, falling back to the pickle format of older indexes
+            if metadata_path.exists():
+                with open(metadata_path, 'r', encoding='utf-8') as f:
+                    metadata = json.load(f)
+            else:
+                import pickle
+                with open(legacy_metadata_path, 'rb') as f:
+                    metadata = pickle.load(f)
             
             # Verify embedding model compatibility
             if metadata.get('embedding_model') != self.embedding_model:
                 logger.warning(f"Embedding model mismatch: expected {self.embedding_model}, "
                              f"found {metadata.get('embedding_model')}")
             
+            # Indexes saved before the metric was recorded use L2 distance
+            distance_strategy = DistanceStrategy(
+                metadata.get('distance_strategy', DistanceStrategy.EUCLIDEAN_DISTANCE.value)
+            )
+            if distance_strategy != DistanceStrategy.MAX_INNER_PRODUCT:
+                logger.warning("Vector store uses L2 distance; rebuild the knowledge base to use inner-product search")
+            
             # Load FAISS index
             self.vector_store = FAISS.load_local(
                 str(faiss_path),
                 self.embeddings,
-                allow_dangerous_deserialization=True
+                allow_dangerous_deserialization=True,
+                distance_strategy=distance_strategy
             )
+            hnsw = getattr(self.vector_store.index, 'hnsw', None)
+            if hnsw is not None:
+                hnsw.efSearch = self.ef_search
             
             logger.info(f"Vector store loaded from {file_path} with {metadata.get('document_count', 0)} documents")
             return True
@@ -218,6 +498,6 @@ class VectorStore:
         
         return {
             'status': 'initialized',
-            'document_count': len(self.vector_store.docstore._dict),
+            'document_count': self.vector_store.index.ntotal,
             'embedding_model': self.embedding_model
         }
\ No newline at end of file